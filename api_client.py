@@ -1,37 +1,206 @@
+import hashlib
+import importlib.util
 import json
+import random
 import re
 import time
-from typing import Dict, Optional
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 import aiohttp
 import asyncio
-
-
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# httpx only negotiates HTTP/2 when the h2 extra is installed.
+if importlib.util.find_spec("h2") is not None:
+    try:
+        import httpx
+    except ImportError:
+        httpx = None
+else:
+    httpx = None
+
+try:
+    import simdjson
+
+    # Lazy parser for 429 bodies: only the few retry keys are materialized.
+    _sd_parser = simdjson.Parser()
+    _JSON_OBJECT_TYPES: Tuple[type, ...] = (dict, simdjson.Object)
+except ImportError:
+    _sd_parser = None
+    _JSON_OBJECT_TYPES = (dict,)
+
+try:
+    import brotli  # noqa: F401
+except ImportError:
+    try:
+        import brotlicffi as brotli  # noqa: F401
+    except ImportError:
+        brotli = None
+
+# Only advertise br when a decoder is available, otherwise the transport cannot inflate it.
+_ACCEPT_ENCODING = "gzip, br" if brotli is not None else "gzip"
+
+_TOTAL_TIMEOUT_SECONDS = 20
+_DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=_TOTAL_TIMEOUT_SECONDS)
+
+_RETRY_RE = re.compile(r"(\d+)\s*(?:s|sec|secondes?)", re.IGNORECASE)
+_RETRY_KEYS = ("retry_after", "cooldown", "wait_seconds")
+_RETRY_KEY_SET = frozenset(_RETRY_KEYS)
+
+
+def _coerce_seconds(value: object) -> Optional[int]:
+    # Exact type checks: bool subclasses int and a JSON `true` is not a delay.
+    if type(value) is int:
+        return max(1, value)
+    if type(value) is str and value.isdigit():
+        return max(1, int(value))
+    return None
+
+
+def _scan_retry_keys(obj: Any) -> Optional[int]:
+    if type(obj) is dict:
+        # Error envelopes are small: one pass over the items beats probing each key.
+        for key, value in obj.items():
+            if key in _RETRY_KEY_SET:
+                seconds = _coerce_seconds(value)
+                if seconds is not None:
+                    return seconds
+        return None
+    # Lazy simdjson documents: only probe the keys we need.
+    for key in _RETRY_KEYS:
+        seconds = _coerce_seconds(obj.get(key))
+        if seconds is not None:
+            return seconds
+    return None
+
+
 class AlpinnApiError(Exception):
     def __init__(self, message: str, retry_after: Optional[int] = None) -> None:
         self.retry_after = retry_after
         super().__init__(message)
 
 
-class ApiRateLimitError(Exception):
+class ApiRateLimitError(Exception):
     def __init__(self, remaining_seconds: int) -> None:
         self.remaining_seconds = remaining_seconds
         super().__init__(f"Cooldown global actif: {remaining_seconds}s")
 
 
 class AlpinnApiClient:
-    def __init__(self, rate_limit_seconds: int = 60) -> None:
+    __slots__ = (
+        "rate_limit_seconds",
+        "max_retries",
+        "backoff_base",
+        "backoff_cap",
+        "_interval_ns",
+        "_capacity_ns",
+        "_credit_ns",
+        "_last_refill_ns",
+        "_server_ready_ns",
+        "_lock",
+        "_session",
+        "_http2_client",
+        "_base_url_cache",
+        "_headers_cache",
+    )
+
+    def __init__(
+        self,
+        rate_limit_seconds: int = 60,
+        burst: int = 1,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 30.0,
+    ) -> None:
         self.rate_limit_seconds = rate_limit_seconds
-        self._last_request_at = 0.0
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        # Token bucket kept in integer nanoseconds of credit: one request costs one interval.
+        self._interval_ns = max(1, rate_limit_seconds) * 1_000_000_000
+        self._capacity_ns = max(1, burst) * self._interval_ns
+        self._credit_ns = self._capacity_ns
+        self._last_refill_ns = time.monotonic_ns()
+        # Earliest time the remote API told us to come back (429 Retry-After / reset headers).
+        self._server_ready_ns = 0
         self._lock = asyncio.Lock()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._http2_client: Any = None
+        self._base_url_cache: Tuple[str, str] = ("", "")
+        self._headers_cache: Tuple[str, Dict[str, str]] = ("", {"X-API-Key": "", "Accept-Encoding": _ACCEPT_ENCODING})
 
-    def _check_cooldown(self) -> None:
-        now = time.monotonic()
-        elapsed = now - self._last_request_at
-        if elapsed < self.rate_limit_seconds:
-            remaining = int(self.rate_limit_seconds - elapsed)
-            raise ApiRateLimitError(max(1, remaining))
+    def _check_cooldown(self) -> None:
+        now = time.monotonic_ns()
+        # Server-advised cooldown first, so a refused request does not spend bucket credit.
+        if now < self._server_ready_ns:
+            raise ApiRateLimitError(max(1, -(-(self._server_ready_ns - now) // 1_000_000_000)))
+        self._credit_ns = min(self._capacity_ns, self._credit_ns + (now - self._last_refill_ns))
+        self._last_refill_ns = now
+        if self._credit_ns < self._interval_ns:
+            missing_ns = self._interval_ns - self._credit_ns
+            raise ApiRateLimitError(max(1, -(-missing_ns // 1_000_000_000)))
+        self._credit_ns -= self._interval_ns
 
+    def cooldown_remaining(self) -> float:
+        now = time.monotonic_ns()
+        credit = min(self._capacity_ns, self._credit_ns + (now - self._last_refill_ns))
+        missing_ns = max(0, self._interval_ns - credit)
+        return max(missing_ns, self._server_ready_ns - now) / 1_000_000_000
+
+    def _defer_until(self, seconds: float) -> None:
+        ready_ns = time.monotonic_ns() + int(seconds * 1_000_000_000)
+        self._server_ready_ns = max(self._server_ready_ns, ready_ns)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=_DEFAULT_TIMEOUT,
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=75),
+            )
+        return self._session
+
+    async def _fetch(
+        self,
+        url: str,
+        params: Optional[Dict[str, str]],
+        headers: Dict[str, str],
+    ) -> Tuple[int, Mapping[str, str], bytes]:
+        if httpx is not None:
+            if self._http2_client is None or self._http2_client.is_closed:
+                # Same semantics as the aiohttp path: redirects are followed.
+                self._http2_client = httpx.AsyncClient(
+                    http2=True,
+                    follow_redirects=True,
+                    timeout=float(_TOTAL_TIMEOUT_SECONDS),
+                    limits=httpx.Limits(max_keepalive_connections=10),
+                )
+            # httpx timeouts apply per phase; bound the whole request like ClientTimeout(total=...).
+            resp = await asyncio.wait_for(
+                self._http2_client.get(url, params=params, headers=headers),
+                timeout=_TOTAL_TIMEOUT_SECONDS,
+            )
+            return resp.status_code, resp.headers, resp.content
+
+        session = await self._get_session()
+        async with session.get(url, params=params, headers=headers) as resp:
+            body = await resp.read()
+        return resp.status, resp.headers, body
+
+    async def close(self) -> None:
+        if self._http2_client is not None and not self._http2_client.is_closed:
+            await self._http2_client.aclose()
+        self._http2_client = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     async def get_json(
         self,
         base_url: str,
@@ -39,70 +208,131 @@ class AlpinnApiClient:
         api_key: str,
         params: Optional[Dict[str, str]] = None,
     ) -> Dict:
+        body = await self._get_body(base_url, path, api_key, params)
+        return self._parse_body(body)
+
+    async def get_json_digest(
+        self,
+        base_url: str,
+        path: str,
+        api_key: str,
+        params: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Dict, bytes]:
+        # Digest of the raw response so callers can tell an identical payload without diffing it.
+        body = await self._get_body(base_url, path, api_key, params)
+        return self._parse_body(body), hashlib.blake2b(body, digest_size=8).digest()
+
+    async def _get_body(
+        self,
+        base_url: str,
+        path: str,
+        api_key: str,
+        params: Optional[Dict[str, str]],
+    ) -> bytes:
         async with self._lock:
             self._check_cooldown()
-            self._last_request_at = time.monotonic()
-
-            url = f"{base_url.rstrip('/')}{path}"
-            headers = {"X-API-Key": api_key}
-
-            timeout = aiohttp.ClientTimeout(total=20)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url, params=params or {}, headers=headers) as resp:
-                    text = await resp.text()
-
-                if resp.status == 401:
-                    raise AlpinnApiError("401: Cle API invalide ou absente")
-                if resp.status == 403:
-                    raise AlpinnApiError("403: IP bloquee")
-                if resp.status == 429:
-                    retry_after = self._extract_retry_after(resp, text)
-                    msg = "429: Rate limit API distant"
-                    if retry_after:
-                        msg += f" (retry_after={retry_after}s)"
-                    raise AlpinnApiError(msg, retry_after=retry_after)
-                if resp.status >= 400:
-                    raise AlpinnApiError(f"HTTP {resp.status}: {text[:200]}")
-
-                try:
-                    return json.loads(text)
-                except json.JSONDecodeError:
-                    return {"raw": text}
-
-    def _extract_retry_after(self, resp: aiohttp.ClientResponse, body_text: str) -> Optional[int]:
-        header_value = resp.headers.get("Retry-After")
+
+        cached_in, cached_out = self._base_url_cache
+        if cached_in is base_url:
+            stripped = cached_out
+        else:
+            stripped = base_url.rstrip("/")
+            self._base_url_cache = (base_url, stripped)
+        url = f"{stripped}{path}"
+        cached_key, headers = self._headers_cache
+        if cached_key is not api_key:
+            headers = {"X-API-Key": api_key, "Accept-Encoding": _ACCEPT_ENCODING}
+            self._headers_cache = (api_key, headers)
+
+        attempt = 0
+        while True:
+            status, resp_headers, body = await self._fetch(url, params, headers)
+            if status != 429:
+                break
+
+            retry_after = self._extract_retry_after(resp_headers, body)
+            delay = self._backoff_delay(attempt, retry_after)
+            if delay is None:
+                msg = "429: Rate limit API distant"
+                if retry_after:
+                    msg += f" (retry_after={retry_after}s)"
+                    self._defer_until(retry_after)
+                raise AlpinnApiError(msg, retry_after=retry_after)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        if resp_headers.get("X-RateLimit-Remaining") == "0":
+            reset_after = _coerce_seconds(resp_headers.get("X-RateLimit-Reset-After"))
+            if reset_after is not None:
+                self._defer_until(reset_after)
+
+        if status == 401:
+            raise AlpinnApiError("401: Cle API invalide ou absente")
+        if status == 403:
+            raise AlpinnApiError("403: IP bloquee")
+        if status >= 400:
+            text = body[:800].decode("utf-8", "replace")
+            raise AlpinnApiError(f"HTTP {status}: {text[:200]}")
+        return body
+
+    def _parse_body(self, body: bytes) -> Dict:
+        try:
+            return _loads(body)
+        except ValueError:
+            return {"raw": body.decode("utf-8", "replace")}
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[int]) -> Optional[float]:
+        if attempt >= self.max_retries:
+            return None
+        if retry_after:
+            # Too long to wait inline: let the caller reschedule instead.
+            if retry_after > self.backoff_cap:
+                return None
+            return float(retry_after)
+        # Full jitter: uniform in [0, min(cap, base * 2^attempt)].
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+    def _extract_retry_after(self, headers: Mapping[str, str], body: bytes) -> Optional[int]:
+        header_value = headers.get("Retry-After")
         if header_value and header_value.isdigit():
             return max(1, int(header_value))
+        if header_value:
+            try:
+                retry_at = parsedate_to_datetime(header_value)
+            except (TypeError, ValueError):
+                retry_at = None
+            if retry_at is not None:
+                return max(1, int(retry_at.timestamp() - time.time()))
 
+        # Plain-text / HTML error pages carry no cooldown metadata; peek at a bounded prefix
+        # so a large error page is not copied just to find its first byte.
+        if body[:64].lstrip()[:1] != b"{":
+            return None
         try:
-            payload = json.loads(body_text)
-        except json.JSONDecodeError:
+            # simdjson invalidates the previous document on the next parse; this is safe
+            # because nothing awaits while the document is in use and values are
+            # converted to plain ints before returning.
+            payload = _sd_parser.parse(body) if _sd_parser is not None else _loads(body)
+        except ValueError:
+            return None
+
+        if not isinstance(payload, _JSON_OBJECT_TYPES):
             return None
 
         # Common JSON shapes for cooldown metadata.
-        candidates = [
-            payload.get("retry_after"),
-            payload.get("cooldown"),
-            payload.get("wait_seconds"),
-        ]
+        seconds = _scan_retry_keys(payload)
+        if seconds is not None:
+            return seconds
+
         error_obj = payload.get("error")
-        if isinstance(error_obj, dict):
-            candidates.extend(
-                [
-                    error_obj.get("retry_after"),
-                    error_obj.get("cooldown"),
-                    error_obj.get("wait_seconds"),
-                ]
-            )
-            message = error_obj.get("message")
-            if isinstance(message, str):
-                m = re.search(r"(\d+)\s*(?:s|sec|secondes?)", message.lower())
-                if m:
-                    return max(1, int(m.group(1)))
-
-        for value in candidates:
-            if isinstance(value, int):
-                return max(1, value)
-            if isinstance(value, str) and value.isdigit():
-                return max(1, int(value))
+        if not isinstance(error_obj, _JSON_OBJECT_TYPES):
+            return None
+        seconds = _scan_retry_keys(error_obj)
+        if seconds is not None:
+            return seconds
+        message = error_obj.get("message")
+        if isinstance(message, str):
+            m = _RETRY_RE.search(message)
+            if m:
+                return max(1, int(m.group(1)))
         return None
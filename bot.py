@@ -1,14 +1,15 @@
 import asyncio
-import hashlib
-import html
 import json
+import math
 import os
 import re
-import shutil
-import subprocess
+import signal
+import stat
 import sys
+import tempfile
 import time
-from typing import Any, Dict, List, Optional
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 from pathlib import Path
 
@@ -18,9 +19,17 @@ from dotenv import load_dotenv
 
 from config_manager import ConfigManager
 from api_client import AlpinnApiClient, AlpinnApiError, ApiRateLimitError
+from signatures import SIGNATURE_SCHEMA, payload_signature
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 
 load_dotenv()
+# Read once: the messages already ask for a restart after editing .env.
+ALPINN_API_KEY = os.getenv("ALPINN_API_KEY", "").strip()
 
 
 def normalize_base_url(url: str) -> str:
@@ -33,16 +42,63 @@ def normalize_base_url(url: str) -> str:
 class AlpinnBot(commands.Bot):
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
-        self.config = ConfigManager("bot_config.json")
+        self.config = ConfigManager("bot_config.json", cache=os.getenv("ALPINN_CONFIG_CACHE", "1") != "0")
         self.api_client = AlpinnApiClient(rate_limit_seconds=60)
         self.auto_refresh_task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        # Set by SIGTERM: main() then exits 143 like an unhandled kill, so the supervisor restarts the bot.
+        self.stopped_by_signal = False
+        self._signal_close_task: Optional[asyncio.Task] = None
+        # Serializes config file writes, which run in worker threads.
+        self.config_lock = asyncio.Lock()
 
     async def setup_hook(self) -> None:
+        if hasattr(signal, "SIGTERM") and sys.platform != "win32":
+            # The update script stops the bot with a plain `kill`: close() still flushes the config.
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self._on_sigterm)
         save_reconciled_config()
         if self.auto_refresh_task is None:
             self.auto_refresh_task = asyncio.create_task(auto_refresh_worker())
         print(f"Connecte en tant que {self.user} (ID: {self.user.id if self.user else 'N/A'})")
 
+    def _on_sigterm(self) -> None:
+        self.stopped_by_signal = True
+        if self._signal_close_task is None:
+            # Kept on the bot: the loop only holds a weak reference to running tasks.
+            self._signal_close_task = asyncio.create_task(self.close())
+
+    def mark_dirty(self, patch: Dict[str, Any]) -> None:
+        # Upserts stage their state in memory; one write per CONFIG_FLUSH_DELAY_SECONDS window.
+        if not self.config.stage(patch):
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._debounced_flush())
+
+    async def _debounced_flush(self) -> None:
+        await asyncio.sleep(CONFIG_FLUSH_DELAY_SECONDS)
+        await self.flush_config()
+
+    async def flush_config(self) -> None:
+        # The JSON write runs off the event loop; anything staged meanwhile is written next.
+        async with self.config_lock:
+            while self.config.dirty:
+                await asyncio.to_thread(self.config.flush)
+
+    async def close(self) -> None:
+        try:
+            if self._flush_task is not None:
+                # Not cancelled: a write already handed to a thread would keep running unlocked.
+                (result,) = await asyncio.gather(self._flush_task, return_exceptions=True)
+                if isinstance(result, Exception):
+                    print(f"[config] Flush failed: {result}")
+            try:
+                await self.flush_config()
+            except Exception as exc:  # noqa: BLE001
+                print(f"[config] Flush failed: {exc}")
+            await self.api_client.close()
+        finally:
+            await super().close()
+
 
 intents = discord.Intents.default()
 intents.message_content = True
@@ -52,9 +108,26 @@ AUTOSTART_SCRIPT_RELATIVE_PATH = os.path.join("RUN_Ubuntu", "Manage_Autostart.sh
 CONFIG_BACKUP_DIR_NAME = "config_backups"
 UPDATE_DELAY_FILE_NAME = ".update_poll_minutes"
 BACKGROUND_MODE_FILE_NAME = ".background_mode"
-
-
-ENDPOINT_NAMES = ["association", "news", "statuts", "staff", "activities", "events"]
+# Resolved once: these only depend on where bot.py lives.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+AUTOSTART_SCRIPT_PATH = os.path.join(SCRIPT_DIR, AUTOSTART_SCRIPT_RELATIVE_PATH)
+UPDATE_DELAY_FILE_PATH = os.path.join(os.path.dirname(SCRIPT_DIR), UPDATE_DELAY_FILE_NAME)
+BACKGROUND_MODE_FILE_PATH = os.path.join(os.path.dirname(SCRIPT_DIR), BACKGROUND_MODE_FILE_NAME)
+UPDATE_LOG_PATH = os.path.join(SCRIPT_DIR, "update.log")
+# on/off/status argument of the toggle commands -> requested state (None: status only).
+TOGGLE_MODES: Dict[str, Optional[bool]] = {"on": True, "off": False, "status": None}
+# Linux FICLONE ioctl: copy-on-write clone on btrfs/xfs, refused elsewhere.
+FICLONE_IOCTL = 0x40049409
+CONFIG_FLUSH_DELAY_SECONDS = 1.0
+DISCORD_EPOCH_MS = 1420070400000
+BULK_DELETE_MAX_AGE_MS = 14 * 24 * 3600 * 1000
+# Concurrent Discord edits per upsert pass; Discord allows ~5 message writes/s per channel.
+UPSERT_CONCURRENCY = 5
+PURGE_CONCURRENCY = 4
+
+
+ENDPOINT_NAMES = ("association", "news", "statuts", "staff", "activities", "events")
+ENDPOINT_NAME_SET = frozenset(ENDPOINT_NAMES)
 META_KEYS = {
     "success",
     "version",
@@ -67,20 +140,14 @@ META_KEYS = {
 
 
 def build_request_config() -> Dict[str, Any]:
-    data = bot.config.load()
+    data = bot.config.view()
     base_url = data.get("base_url")
-    api_key = os.getenv("ALPINN_API_KEY", "").strip()
+    api_key = ALPINN_API_KEY
     if not base_url or not api_key:
         raise ValueError("Configuration incomplete. Utilise !set_base_url et definis ALPINN_API_KEY dans l'environnement.")
     channels = data.get("channels", {})
-    if not isinstance(channels, dict):
-        channels = {}
     auto_enabled_endpoints = data.get("auto_enabled_endpoints", [])
-    if not isinstance(auto_enabled_endpoints, list):
-        auto_enabled_endpoints = []
     auto_messages = data.get("auto_messages", {})
-    if not isinstance(auto_messages, dict):
-        auto_messages = {}
     return {
         "base_url": base_url,
         "api_key": api_key,
@@ -100,7 +167,7 @@ def admin_only_global_check(ctx: commands.Context) -> bool:
 
 
 def has_alpinn_api_key() -> bool:
-    return bool(os.getenv("ALPINN_API_KEY", "").strip())
+    return bool(ALPINN_API_KEY)
 
 
 async def ensure_api_key_or_warn(ctx: commands.Context) -> bool:
@@ -122,6 +189,9 @@ def endpoint_channel_ids(channels: Dict[str, Any], endpoint_name: str) -> List[i
     if isinstance(raw, str) and raw.isdigit():
         return [int(raw)]
     if isinstance(raw, list):
+        # Common case: the JSON already holds plain ints, no coercion needed.
+        if all(type(item) is int for item in raw):
+            return list(raw)
         result: List[int] = []
         for item in raw:
             try:
@@ -137,11 +207,7 @@ def normalize_channels(channels: Any) -> Dict[str, List[int]]:
         channels = {}
     normalized: Dict[str, List[int]] = {}
     for ep in ENDPOINT_NAMES:
-        ids = endpoint_channel_ids(channels, ep)
-        unique_ids = []
-        for cid in ids:
-            if cid not in unique_ids:
-                unique_ids.append(cid)
+        unique_ids = list(dict.fromkeys(endpoint_channel_ids(channels, ep)))
         if unique_ids:
             normalized[ep] = unique_ids
     return normalized
@@ -149,19 +215,18 @@ def normalize_channels(channels: Any) -> Dict[str, List[int]]:
 
 def reconcile_config_state(base: Dict[str, Any]) -> Dict[str, Any]:
     cfg = dict(base)
+    if cfg.get("signature_schema") != SIGNATURE_SCHEMA:
+        cfg["auto_signatures"] = {}
+        cfg["auto_news_signatures"] = {}
+        cfg["auto_association_signatures"] = {}
+        cfg["signature_schema"] = SIGNATURE_SCHEMA
     channels = normalize_channels(cfg.get("channels", {}))
 
     enabled = cfg.get("auto_enabled_endpoints", [])
-    if not isinstance(enabled, list):
-        enabled = []
-    enabled = [ep for ep in enabled if ep in ENDPOINT_NAMES and channels.get(ep)]
+    enabled = [ep for ep in enabled if ep in ENDPOINT_NAME_SET and channels.get(ep)]
 
     auto_messages = cfg.get("auto_messages", {})
     auto_signatures = cfg.get("auto_signatures", {})
-    if not isinstance(auto_messages, dict):
-        auto_messages = {}
-    if not isinstance(auto_signatures, dict):
-        auto_signatures = {}
 
     cleaned_auto_messages: Dict[str, Dict[str, int]] = {}
     cleaned_auto_signatures: Dict[str, Dict[str, str]] = {}
@@ -181,10 +246,6 @@ def reconcile_config_state(base: Dict[str, Any]) -> Dict[str, Any]:
 
     auto_news_messages = cfg.get("auto_news_messages", {})
     auto_news_signatures = cfg.get("auto_news_signatures", {})
-    if not isinstance(auto_news_messages, dict):
-        auto_news_messages = {}
-    if not isinstance(auto_news_signatures, dict):
-        auto_news_signatures = {}
 
     cleaned_news_messages: Dict[str, Dict[str, int]] = {}
     cleaned_news_signatures: Dict[str, Dict[str, str]] = {}
@@ -207,10 +268,6 @@ def reconcile_config_state(base: Dict[str, Any]) -> Dict[str, Any]:
 
     auto_association_messages = cfg.get("auto_association_messages", {})
     auto_association_signatures = cfg.get("auto_association_signatures", {})
-    if not isinstance(auto_association_messages, dict):
-        auto_association_messages = {}
-    if not isinstance(auto_association_signatures, dict):
-        auto_association_signatures = {}
 
     cleaned_assoc_messages: Dict[str, Dict[str, int]] = {}
     cleaned_assoc_signatures: Dict[str, Dict[str, str]] = {}
@@ -247,7 +304,10 @@ def save_reconciled_config(patch: Optional[Dict[str, Any]] = None) -> Dict[str,
     if patch:
         cfg.update(patch)
     cfg = reconcile_config_state(cfg)
-    bot.config.update(cfg)
+    # Admin commands (unset_channel, clear, config restore) may drop tracking entries.
+    _VERIFIED_MESSAGE_IDS.intersection_update(tracked_message_ids(cfg))
+    # Staged for the debounced write; admin commands await bot.flush_config() before confirming.
+    bot.mark_dirty(cfg)
     return cfg
 
 
@@ -259,24 +319,62 @@ def config_backup_dir() -> Path:
     return config_file_path().parent / CONFIG_BACKUP_DIR_NAME
 
 
+# (backup dir st_mtime_ns, backups newest first); adding or removing a file bumps the dir mtime.
+_backup_list_cache: Tuple[int, List[Path]] = (-1, [])
+
+
 def list_config_backups() -> List[Path]:
+    global _backup_list_cache
     backup_dir = config_backup_dir()
-    if not backup_dir.exists():
+    try:
+        dir_mtime = backup_dir.stat().st_mtime_ns
+    except OSError:
         return []
+    cached_mtime, cached_files = _backup_list_cache
+    if cached_mtime == dir_mtime:
+        return list(cached_files)
     files = [p for p in backup_dir.glob("*.json") if p.is_file()]
     files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    return files
+    _backup_list_cache = (dir_mtime, files)
+    return list(files)
+
+
+def copy_config_file(src: Path, dst: Path) -> None:
+    import shutil
+
+    # No hardlink: bot_config.json can still be edited in place by hand (e.g. with nano),
+    # which would silently alter every backup linked to it.
+    if fcntl is not None:
+        try:
+            with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+                fcntl.ioctl(dst_file.fileno(), FICLONE_IOCTL, src_file.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def replace_config_file(src: Path, dst: Path) -> None:
+    # Copy beside the live config then swap it in, so a crash never leaves a half-copied config.
+    tmp_path = dst.with_name(dst.name + ".restore.tmp")
+    copy_config_file(src, tmp_path)
+    os.replace(tmp_path, dst)
 
 
 def create_config_backup(prefix: str = "bot_config_backup") -> Path:
+    global _backup_list_cache
     cfg_path = config_file_path()
+    bot.config.flush()
     if not cfg_path.exists():
         bot.config.load()
     backup_dir = config_backup_dir()
     backup_dir.mkdir(parents=True, exist_ok=True)
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     backup_path = backup_dir / f"{prefix}_{timestamp}.json"
-    shutil.copy2(cfg_path, backup_path)
+    copy_config_file(cfg_path, backup_path)
+    # Do not rely on the dir mtime alone: coarse timestamps could hide a backup made in the same tick.
+    _backup_list_cache = (-1, [])
     return backup_path
 
 
@@ -323,18 +421,21 @@ def extract_query_pairs(raw: Optional[str]) -> Dict[str, str]:
     return params
 
 
+_ENDPOINT_PATHS = {
+    "association": "/api/v1/association.php",
+    "news": "/api/v1/news.php",
+    "statuts": "/api/v1/statuts.php",
+    "staff": "/api/v1/staff.php",
+    "activities": "/api/v1/activities.php",
+    "events": "/api/v1/events.php",
+}
+
+
 def endpoint_path(name: str) -> str:
-    allowed = {
-        "association": "/api/v1/association.php",
-        "news": "/api/v1/news.php",
-        "statuts": "/api/v1/statuts.php",
-        "staff": "/api/v1/staff.php",
-        "activities": "/api/v1/activities.php",
-        "events": "/api/v1/events.php",
-    }
-    if name not in allowed:
-        raise ValueError(f"Endpoint inconnu: {name}")
-    return allowed[name]
+    try:
+        return _ENDPOINT_PATHS[name]
+    except KeyError:
+        raise ValueError(f"Endpoint inconnu: {name}") from None
 
 
 def has_displayable_data(payload: Any) -> bool:
@@ -362,46 +463,56 @@ def no_data_message(ep_name: str) -> str:
     return f"Aucune donnee disponible actuellement pour l'endpoint `{ep_name}`."
 
 
+_IMAGE_EXT_NAMES = frozenset({"png", "jpg", "jpeg", "gif", "webp", "bmp"})
+
+
 def looks_like_image_url(value: str) -> bool:
-    url = value.strip().lower()
-    if not (url.startswith("http://") or url.startswith("https://")):
+    url = value.strip()
+    if not url[:8].lower().startswith(("http://", "https://")):
         return False
-    image_exts = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp")
-    return any(url.endswith(ext) for ext in image_exts) or "image" in url
+    # Only the path extension counts: query strings and fragments are ignored.
+    path = url.split("#", 1)[0].split("?", 1)[0]
+    _, dot, ext = path.rpartition("/")[2].rpartition(".")
+    return bool(dot) and ext.lower() in _IMAGE_EXT_NAMES
+
+
+_PREFERRED_IMAGE_KEYS = (
+    "image",
+    "image_url",
+    "thumbnail",
+    "thumbnail_url",
+    "photo",
+    "picture",
+    "banner",
+    "cover",
+    "avatar",
+    "url",
+)
+_PREFERRED_IMAGE_KEYSET = frozenset(_PREFERRED_IMAGE_KEYS)
 
 
 def find_image_url(value: Any, depth: int = 0) -> Optional[str]:
+    # Depth-first walk with an explicit stack; children are pushed in reverse so they
+    # are visited in the same order as the former recursive version.
     if depth > 3:
         return None
-    if isinstance(value, str) and looks_like_image_url(value):
-        return value.strip()
-    if isinstance(value, dict):
-        preferred_keys = [
-            "image",
-            "image_url",
-            "thumbnail",
-            "thumbnail_url",
-            "photo",
-            "picture",
-            "banner",
-            "cover",
-            "avatar",
-            "url",
-        ]
-        for key in preferred_keys:
-            if key in value:
-                found = find_image_url(value.get(key), depth + 1)
-                if found:
-                    return found
-        for sub in value.values():
-            found = find_image_url(sub, depth + 1)
-            if found:
-                return found
-    if isinstance(value, list):
-        for sub in value[:10]:
-            found = find_image_url(sub, depth + 1)
-            if found:
-                return found
+    stack = [(value, depth)]
+    while stack:
+        node, node_depth = stack.pop()
+        if isinstance(node, str):
+            if looks_like_image_url(node):
+                return node.strip()
+            continue
+        # Children of a node at the depth budget would be discarded anyway: do not push them.
+        if node_depth >= 3:
+            continue
+        child_depth = node_depth + 1
+        if isinstance(node, dict):
+            stack.extend((sub, child_depth) for sub in reversed(node.values()))
+            if not _PREFERRED_IMAGE_KEYSET.isdisjoint(node):
+                stack.extend((node[key], child_depth) for key in reversed(_PREFERRED_IMAGE_KEYS) if key in node)
+        elif isinstance(node, list):
+            stack.extend((node[index], child_depth) for index in range(min(len(node), 10) - 1, -1, -1))
     return None
 
 
@@ -410,7 +521,10 @@ def extract_image_url(payload: Any) -> Optional[str]:
 
 
 def build_image_embed(ep_name: str, payload: Any, for_auto: bool) -> Optional[discord.Embed]:
-    image_url = extract_image_url(payload)
+    return image_embed(ep_name, extract_image_url(payload), for_auto)
+
+
+def image_embed(ep_name: str, image_url: Optional[str], for_auto: bool) -> Optional[discord.Embed]:
     if not image_url:
         return None
     title = f"{ep_name.upper()} - Image"
@@ -420,6 +534,16 @@ def build_image_embed(ep_name: str, payload: Any, for_auto: bool) -> Optional[di
     return embed
 
 
+def join_capped(lines: List[str], sep: str, cap: int) -> str:
+    # Same result as sep.join(lines)[:cap] without joining lines that would be cut anyway.
+    size = -len(sep)
+    for count, line in enumerate(lines, start=1):
+        size += len(sep) + len(line)
+        if size >= cap:
+            return sep.join(lines[:count])[:cap]
+    return sep.join(lines)
+
+
 def truncate_text(value: str, max_len: int = 220) -> str:
     text = value.strip()
     if len(text) <= max_len:
@@ -427,62 +551,178 @@ def truncate_text(value: str, max_len: int = 220) -> str:
     return text[: max_len - 3] + "..."
 
 
+_COMPACT_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+# Past this many items (top level plus one nesting level), stopping the pure-Python
+# iterencode early beats serializing everything with the C encoder.
+_COMPACT_JSON_STREAM_MIN_ITEMS = 128
+
+
+def json_item_count_exceeds(value: Any, limit: int) -> bool:
+    if isinstance(value, dict):
+        items = value.values()
+    elif isinstance(value, list):
+        items = value
+    else:
+        return False
+    count = len(items)
+    if count > limit:
+        return True
+    for item in items:
+        if isinstance(item, (dict, list)):
+            count += len(item)
+            if count > limit:
+                return True
+    return False
+
+
+def compact_json_text(value: Any, max_len: int) -> str:
+    # Same result as truncate_text(json.dumps(value, ensure_ascii=False), max_len).
+    # iterencode never uses the C encoder, so it is only worth it when most of the output
+    # would be thrown away.
+    if not json_item_count_exceeds(value, _COMPACT_JSON_STREAM_MIN_ITEMS):
+        return truncate_text(json.dumps(value, ensure_ascii=False), max_len)
+    chunks: List[str] = []
+    size = 0
+    for chunk in _COMPACT_JSON_ENCODER.iterencode(value):
+        chunks.append(chunk)
+        size += len(chunk)
+        # One extra char: a separator chunk may end with a space that truncate_text strips.
+        if size > max_len + 1:
+            break
+    return truncate_text("".join(chunks), max_len)
+
+
+_RE_EXTRA_NEWLINES = re.compile(r"\n{3,}")
+
+
+# tag -> (markdown emitted on the opening tag, markdown emitted on the closing tag)
+_MD_TAGS: Dict[str, Tuple[str, str]] = {
+    "br": ("\n", ""),
+    "p": ("", "\n\n"),
+    "strong": ("**", "**"),
+    "b": ("**", "**"),
+    "em": ("*", "*"),
+    "i": ("*", "*"),
+    "u": ("__", "__"),
+    "s": ("~~", "~~"),
+    "strike": ("~~", "~~"),
+    "li": ("\n- ", ""),
+    "ul": ("\n", "\n"),
+    "ol": ("\n", "\n"),
+}
+
+
+class _MarkdownConverter(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._buf: List[str] = []
+        self._link: Optional[Tuple[str, List[str]]] = None
+
+    def _emit(self, text: str) -> None:
+        if self._link is not None:
+            self._link[1].append(text)
+        else:
+            self._buf.append(text)
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href and href.strip():
+                self._flush_link()
+                self._link = (href.strip(), [])
+            return
+        md = _MD_TAGS.get(tag)
+        if md and md[0]:
+            self._emit(md[0])
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "a":
+            if self._link is not None:
+                href, parts = self._link
+                self._link = None
+                label = "".join(parts).strip() or href
+                self._buf.append(f"[{label}]({href})")
+            return
+        md = _MD_TAGS.get(tag)
+        if md and md[1]:
+            self._emit(md[1])
+
+    def handle_data(self, data: str) -> None:
+        self._emit(data)
+
+    def _flush_link(self) -> None:
+        # Unclosed <a>: keep its text without turning it into a link.
+        if self._link is not None:
+            parts = self._link[1]
+            self._link = None
+            self._buf.extend(parts)
+
+    def result(self) -> str:
+        self.close()
+        self._flush_link()
+        return "".join(self._buf)
+
+
 def html_to_markdown(value: str) -> str:
-    text = value
-    text = re.sub(r"(?i)<\s*br\s*/?\s*>", "\n", text)
-    text = re.sub(r"(?i)</\s*p\s*>", "\n\n", text)
-    text = re.sub(r"(?i)<\s*p[^>]*>", "", text)
-    text = re.sub(r"(?i)<\s*(strong|b)\s*>", "**", text)
-    text = re.sub(r"(?i)</\s*(strong|b)\s*>", "**", text)
-    text = re.sub(r"(?i)<\s*(em|i)\s*>", "*", text)
-    text = re.sub(r"(?i)</\s*(em|i)\s*>", "*", text)
-    text = re.sub(r"(?i)<\s*u\s*>", "__", text)
-    text = re.sub(r"(?i)</\s*u\s*>", "__", text)
-    text = re.sub(r"(?i)<\s*(s|strike)\s*>", "~~", text)
-    text = re.sub(r"(?i)</\s*(s|strike)\s*>", "~~", text)
-    text = re.sub(r"(?i)<\s*li[^>]*>", "\n- ", text)
-    text = re.sub(r"(?i)</\s*li\s*>", "", text)
-    text = re.sub(r"(?i)</?\s*(ul|ol)\s*>", "\n", text)
-    text = re.sub(
-        r"(?is)<\s*a[^>]*href\s*=\s*['\"]([^'\"]+)['\"][^>]*>(.*?)</\s*a\s*>",
-        lambda m: f"[{html.unescape(re.sub(r'<[^>]+>', '', m.group(2))).strip() or m.group(1)}]({m.group(1).strip()})",
-        text,
-    )
-    text = re.sub(r"(?s)<[^>]+>", "", text)
-    text = html.unescape(text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    converter = _MarkdownConverter()
+    converter.feed(value)
+    text = _RE_EXTRA_NEWLINES.sub("\n\n", converter.result())
     return text.strip()
 
 
+# Something that actually looks like markup: an opening/closing tag or a comment.
+_HTML_TAG_SNIFF = re.compile(r"</?[a-z][a-z0-9]*\b[^<>]*>|<!--", re.IGNORECASE)
+
+
 def format_rich_text(value: str, max_len: int) -> str:
-    text = html_to_markdown(value) if ("<" in value and ">" in value) else value
+    text = html_to_markdown(value) if ("<" in value and _HTML_TAG_SNIFF.search(value)) else value
     return truncate_text(text, max_len)
 
 
+def scalar_field_text(value: Any, max_len: int) -> Optional[str]:
+    # One type branch per field instead of str(value).strip() followed by a second str().
+    if isinstance(value, str):
+        if not value.strip():
+            return None
+        return format_rich_text(value, max_len)
+    if isinstance(value, (int, float)):
+        return truncate_text(str(value), max_len)
+    return None
+
+
+_ITEM_TITLE_KEYS = ("title", "name", "nom", "label", "event", "headline")
+_ITEM_TITLE_KEYSET = frozenset(_ITEM_TITLE_KEYS)
+
+
 def item_title(item: Dict[str, Any], index: int) -> str:
-    for key in ("title", "name", "nom", "label", "event", "headline"):
+    if _ITEM_TITLE_KEYSET.isdisjoint(item):
+        return f"Element {index}"
+    for key in _ITEM_TITLE_KEYS:
         val = item.get(key)
         if isinstance(val, str) and val.strip():
             return format_rich_text(val, 80)
     return f"Element {index}"
 
 
-def item_summary_lines(item: Dict[str, Any], max_fields: int = 4) -> List[str]:
-    preferred = [
-        "date",
-        "created_at",
-        "published_at",
-        "updated_at",
-        "start_at",
-        "end_at",
-        "status",
-        "author",
-        "location",
-        "description",
-        "excerpt",
-        "subtitle",
-    ]
-    blocked_keys = {
+_ITEM_SUMMARY_PREFERRED = (
+    "date",
+    "created_at",
+    "published_at",
+    "updated_at",
+    "start_at",
+    "end_at",
+    "status",
+    "author",
+    "location",
+    "description",
+    "excerpt",
+    "subtitle",
+)
+_ITEM_SUMMARY_PREFERRED_SET = frozenset(_ITEM_SUMMARY_PREFERRED)
+_ITEM_SUMMARY_BLOCKED = frozenset(
+    {
         "id",
         "content",
         "summary",
@@ -493,36 +733,31 @@ def item_summary_lines(item: Dict[str, Any], max_fields: int = 4) -> List[str]:
         "html",
         "markdown",
     }
+)
+
+
+def item_summary_lines(item: Dict[str, Any], max_fields: int = 4) -> List[str]:
     lines: List[str] = []
     used = 0
 
-    for key in preferred:
+    for key in _ITEM_SUMMARY_PREFERRED:
         if key in item and used < max_fields:
-            value = item.get(key)
-            if isinstance(value, (str, int, float, bool)) and str(value).strip():
-                str_value = str(value)
-                if isinstance(value, str):
-                    str_value = format_rich_text(value, 160)
-                else:
-                    str_value = truncate_text(str_value, 160)
+            str_value = scalar_field_text(item[key], 160)
+            if str_value is not None:
                 lines.append(f"`{key}`: {str_value}")
                 used += 1
 
     if used < max_fields:
         for key, value in item.items():
             key_lower = key.lower()
-            if key in preferred:
+            if key in _ITEM_SUMMARY_PREFERRED_SET:
                 continue
-            if key_lower in blocked_keys or key_lower.endswith("_id"):
+            if key_lower in _ITEM_SUMMARY_BLOCKED or key_lower.endswith("_id"):
                 continue
             if used >= max_fields:
                 break
-            if isinstance(value, (str, int, float, bool)) and str(value).strip():
-                str_value = str(value)
-                if isinstance(value, str):
-                    str_value = format_rich_text(value, 160)
-                else:
-                    str_value = truncate_text(str_value, 160)
+            str_value = scalar_field_text(value, 160)
+            if str_value is not None:
                 lines.append(f"`{key}`: {str_value}")
                 used += 1
     return lines
@@ -566,38 +801,39 @@ def news_item_title(item: Dict[str, Any], index: int) -> str:
     return f"News {index}"
 
 
+_NEWS_TEXT_KEYS = ("content", "article", "body", "text", "description", "summary", "excerpt")
+_NEWS_TEXT_KEYSET = frozenset(_NEWS_TEXT_KEYS)
+
+
 def news_item_text(item: Dict[str, Any]) -> str:
-    for key in ("content", "article", "body", "text", "description", "summary", "excerpt"):
+    if _NEWS_TEXT_KEYSET.isdisjoint(item):
+        return "Aucun texte disponible."
+    for key in _NEWS_TEXT_KEYS:
         value = item.get(key)
         if isinstance(value, str) and value.strip():
             return format_rich_text(value, 1400)
     return "Aucun texte disponible."
 
 
-def news_message_content(item: Dict[str, Any], index: int, for_auto: bool) -> str:
-    epoch = int(time.time())
+def news_message_content(item: Dict[str, Any], index: int, for_auto: bool, epoch: Optional[int] = None) -> str:
     title = news_item_title(item, index)
     body = news_item_text(item)
     lines = [f"**{title}**"]
     if for_auto:
+        if epoch is None:
+            epoch = int(time.time())
         lines.append(f"Mise a jour <t:{epoch}:R>")
     lines.append(body)
     news_url = extract_news_url(item)
     if news_url:
         lines.append(f"[Voir la news]({news_url})")
-    text = "\n\n".join([line for line in lines if line.strip()])
+    # One char past the limit is enough to know whether the tail must be cut.
+    text = join_capped([line for line in lines if line.strip()], "\n\n", 1901)
     if len(text) <= 1900:
         return text
     return text[:1880] + "\n..."
 
 
-def news_message_signature(item: Dict[str, Any], index: int, for_auto: bool) -> str:
-    content = news_message_content(item, index, for_auto)
-    image_url = extract_image_url(item) or ""
-    raw = f"{content}\n[image]{image_url}"
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
-
-
 def association_sections(payload: Any) -> Dict[str, Any]:
     primary = pick_primary_block(payload)
     if isinstance(primary, dict):
@@ -612,30 +848,33 @@ def association_sections(payload: Any) -> Dict[str, Any]:
     return {}
 
 
+_ASSOC_TITLES = {
+    "members": "Membres",
+    "membres": "Membres",
+    "values": "Valeurs",
+    "valeurs": "Valeurs",
+    "volunteers": "Benevoles",
+    "benevoles": "Benevoles",
+    "partners": "Partenaires",
+    "partenaires": "Partenaires",
+    "reports": "Rapports",
+    "rapports": "Rapports",
+    "association_url": "Lien Association",
+}
+
+
 def association_section_title(name: str) -> str:
-    mapping = {
-        "members": "Membres",
-        "membres": "Membres",
-        "values": "Valeurs",
-        "valeurs": "Valeurs",
-        "volunteers": "Benevoles",
-        "benevoles": "Benevoles",
-        "partners": "Partenaires",
-        "partenaires": "Partenaires",
-        "reports": "Rapports",
-        "rapports": "Rapports",
-        "association_url": "Lien Association",
-    }
     lower = name.lower()
-    return mapping.get(lower, name.replace("_", " ").capitalize())
+    return _ASSOC_TITLES.get(lower, name.replace("_", " ").capitalize())
 
 
-def association_section_content(name: str, value: Any, for_auto: bool) -> str:
+def association_section_content(name: str, value: Any, for_auto: bool, epoch: Optional[int] = None) -> str:
     title = association_section_title(name)
-    epoch = int(time.time())
     header = f"**ASSOCIATION - {title}**"
     lines = [header]
     if for_auto:
+        if epoch is None:
+            epoch = int(time.time())
         lines.append(f"Mise a jour <t:{epoch}:R>")
 
     if isinstance(value, str):
@@ -644,12 +883,12 @@ def association_section_content(name: str, value: Any, for_auto: bool) -> str:
             lines.append(f"[Voir]({value})")
         else:
             lines.append(txt)
-        return "\n\n".join(lines)[:1900]
+        return join_capped(lines, "\n\n", 1900)
 
     if isinstance(value, list):
         if not value:
             lines.append("Aucune donnee.")
-            return "\n\n".join(lines)[:1900]
+            return join_capped(lines, "\n\n", 1900)
         max_items = 8
         for idx, item in enumerate(value[:max_items], start=1):
             if isinstance(item, dict):
@@ -662,36 +901,31 @@ def association_section_content(name: str, value: Any, for_auto: bool) -> str:
                 lines.append(f"- {truncate_text(str(item), 200)}")
         if len(value) > max_items:
             lines.append(f"... et {len(value) - max_items} autre(s).")
-        content = "\n".join(lines)
-        return content[:1900]
+        return join_capped(lines, "\n", 1900)
 
     if isinstance(value, dict):
         count = 0
         for k, v in value.items():
             if k in META_KEYS:
                 continue
-            if isinstance(v, (str, int, float, bool)) and str(v).strip():
-                vv = format_rich_text(v, 220) if isinstance(v, str) else truncate_text(str(v), 220)
+            vv = scalar_field_text(v, 220)
+            if vv is not None:
                 lines.append(f"- `{k}`: {vv}")
                 count += 1
             if count >= 10:
                 lines.append("- ...")
                 break
         if count == 0:
-            compact = truncate_text(json.dumps(value, ensure_ascii=False), 1400)
+            compact = compact_json_text(value, 1400)
             lines.append(f"```json\n{compact}\n```")
-        content = "\n".join(lines)
-        return content[:1900]
+        return join_capped(lines, "\n", 1900)
 
     lines.append(truncate_text(str(value), 1500))
-    return "\n\n".join(lines)[:1900]
+    return join_capped(lines, "\n\n", 1900)
 
 
-def association_section_signature(name: str, value: Any, for_auto: bool) -> str:
-    content = association_section_content(name, value, for_auto)
-    image_url = extract_image_url(value) or ""
-    raw = f"{content}\n[image]{image_url}"
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+_ITEM_LIST_KEYS = ("data", "items", "results", "rows", "news", "events", "posts", "articles")
+_PRIMARY_BLOCK_KEYS = ("association", "data", "result", "content", "details", "payload")
 
 
 def extract_items(payload: Any, depth: int = 0) -> Optional[List[Any]]:
@@ -699,27 +933,29 @@ def extract_items(payload: Any, depth: int = 0) -> Optional[List[Any]]:
         return None
     if isinstance(payload, list):
         return payload
-    if isinstance(payload, dict):
-        for key in ("data", "items", "results", "rows", "news", "events", "posts", "articles"):
-            value = payload.get(key)
-            if isinstance(value, list):
-                return value
-            if isinstance(value, dict):
-                nested = extract_items(value, depth + 1)
-                if nested is not None:
-                    return nested
-        for value in payload.values():
-            if isinstance(value, dict):
-                nested = extract_items(value, depth + 1)
-                if nested is not None:
-                    return nested
+    # Same visiting order as a recursive walk: known keys first (a list there wins
+    # immediately), then every nested dict.
+    stack = [(payload, depth)]
+    while stack:
+        node, node_depth = stack.pop()
+        if isinstance(node, list):
+            return node
+        if not isinstance(node, dict) or node_depth > 3:
+            continue
+        children: List[Any] = []
+        for key in _ITEM_LIST_KEYS:
+            value = node.get(key)
+            if isinstance(value, (list, dict)):
+                children.append(value)
+        children.extend(value for value in node.values() if isinstance(value, dict))
+        stack.extend((sub, node_depth + 1) for sub in reversed(children))
     return None
 
 
 def pick_primary_block(payload: Any) -> Any:
     if not isinstance(payload, dict):
         return payload
-    for key in ("association", "data", "result", "content", "details", "payload"):
+    for key in _PRIMARY_BLOCK_KEYS:
         value = payload.get(key)
         if isinstance(value, (dict, list)):
             return value
@@ -731,295 +967,480 @@ def pick_primary_block(payload: Any) -> Any:
     return payload
 
 
-def styled_payload_content(ep_name: str, payload: Any, for_auto: bool) -> str:
-    epoch = int(time.time())
-    header = f"**{ep_name.upper()}** - Mise a jour <t:{epoch}:R>" if for_auto else f"**{ep_name.upper()}**"
-    if not has_displayable_data(payload):
-        return f"{header}\n{no_data_message(ep_name)}"
-
-    primary_payload = pick_primary_block(payload)
-    items = extract_items(primary_payload)
-    pagination = payload.get("pagination") if isinstance(payload, dict) else None
-    meta = payload.get("meta") if isinstance(payload, dict) else None
-    lines: List[str] = [header]
-    if isinstance(items, list):
-        lines.append(f"Total: **{len(items)}**")
-        if isinstance(pagination, dict):
-            page = pagination.get("page")
-            total_pages = pagination.get("total_pages")
-            total = pagination.get("total")
-            if page is not None and total_pages is not None:
-                lines.append(f"Page **{page}/{total_pages}**")
-            if total is not None:
-                lines.append(f"Total API: **{total}**")
-        if isinstance(meta, dict) and meta:
-            lines.append(f"Meta: {truncate_text(json.dumps(meta, ensure_ascii=False), 200)}")
-        if not items:
-            lines.append(no_data_message(ep_name))
-            return "\n".join(lines)
-
-        max_items = 5
-        for idx, raw in enumerate(items[:max_items], start=1):
-            if isinstance(raw, dict):
-                lines.append(f"\n**{idx}. {item_title(raw, idx)}**")
-                for field_line in item_summary_lines(raw, max_fields=4):
-                    lines.append(f"- {field_line}")
-                if ep_name == "news":
-                    news_url = extract_news_url(raw)
-                    if news_url:
-                        lines.append(f"- [Voir la news]({news_url})")
-            else:
-                lines.append(f"\n**{idx}.** {truncate_text(str(raw), 220)}")
+def make_payload_renderer(ep_name: str) -> Callable[[Any, bool, Optional[int]], str]:
+    # Endpoint-specific strings are computed once instead of on every render.
+    header_prefix = f"**{ep_name.upper()}**"
+    auto_header_prefix = f"{header_prefix} - Mise a jour "
+    no_data = no_data_message(ep_name)
+    is_news = ep_name == "news"
 
-        if len(items) > max_items:
-            lines.append(f"\n... et **{len(items) - max_items}** autre(s) element(s).")
-    elif isinstance(primary_payload, dict):
-        # Vue compacte pour objet simple.
-        field_count = 0
-        for key, value in primary_payload.items():
-            if key in META_KEYS:
-                continue
-            if field_count >= 8:
-                lines.append("- ...")
-                break
-            if isinstance(value, (str, int, float, bool)) and str(value).strip():
-                str_value = str(value)
-                if isinstance(value, str):
-                    str_value = format_rich_text(value, 200)
+    def render(payload: Any, for_auto: bool, epoch: Optional[int]) -> str:
+        if for_auto:
+            if epoch is None:
+                epoch = int(time.time())
+            header = f"{auto_header_prefix}<t:{epoch}:R>"
+        else:
+            header = header_prefix
+        if not has_displayable_data(payload):
+            return f"{header}\n{no_data}"
+
+        primary_payload = pick_primary_block(payload)
+        items = extract_items(primary_payload)
+        pagination = payload.get("pagination") if isinstance(payload, dict) else None
+        meta = payload.get("meta") if isinstance(payload, dict) else None
+        lines: List[str] = [header]
+        if isinstance(items, list):
+            lines.append(f"Total: **{len(items)}**")
+            if isinstance(pagination, dict):
+                page = pagination.get("page")
+                total_pages = pagination.get("total_pages")
+                total = pagination.get("total")
+                if page is not None and total_pages is not None:
+                    lines.append(f"Page **{page}/{total_pages}**")
+                if total is not None:
+                    lines.append(f"Total API: **{total}**")
+            if isinstance(meta, dict) and meta:
+                lines.append(f"Meta: {compact_json_text(meta, 200)}")
+            if not items:
+                lines.append(no_data)
+                return "\n".join(lines)
+
+            max_items = 5
+            for idx, raw in enumerate(items[:max_items], start=1):
+                if isinstance(raw, dict):
+                    lines.append(f"\n**{idx}. {item_title(raw, idx)}**")
+                    for field_line in item_summary_lines(raw, max_fields=4):
+                        lines.append(f"- {field_line}")
+                    if is_news:
+                        news_url = extract_news_url(raw)
+                        if news_url:
+                            lines.append(f"- [Voir la news]({news_url})")
                 else:
-                    str_value = truncate_text(str_value, 200)
-                lines.append(f"- `{key}`: {str_value}")
-                field_count += 1
-        if field_count == 0:
-            compact_json = json.dumps(primary_payload, ensure_ascii=False)
-            lines.append(f"```json\n{truncate_text(compact_json, 1200)}\n```")
-    else:
-        lines.append(f"- {truncate_text(str(primary_payload), 1200)}")
+                    lines.append(f"\n**{idx}.** {truncate_text(str(raw), 220)}")
+
+            if len(items) > max_items:
+                lines.append(f"\n... et **{len(items) - max_items}** autre(s) element(s).")
+        elif isinstance(primary_payload, dict):
+            # Vue compacte pour objet simple.
+            field_count = 0
+            for key, value in primary_payload.items():
+                if key in META_KEYS:
+                    continue
+                if field_count >= 8:
+                    lines.append("- ...")
+                    break
+                str_value = scalar_field_text(value, 200)
+                if str_value is not None:
+                    lines.append(f"- `{key}`: {str_value}")
+                    field_count += 1
+            if field_count == 0:
+                lines.append(f"```json\n{compact_json_text(primary_payload, 1200)}\n```")
+        else:
+            lines.append(f"- {truncate_text(str(primary_payload), 1200)}")
 
-    content = "\n".join(lines)
-    if len(content) <= 1900:
-        return content
-    return content[:1880] + "\n..."
+        content = join_capped(lines, "\n", 1901)
+        if len(content) <= 1900:
+            return content
+        return content[:1880] + "\n..."
 
+    return render
 
-def endpoint_message_content(ep_name: str, payload: Dict[str, Any]) -> str:
-    return styled_payload_content(ep_name, payload, for_auto=True)
 
+_PAYLOAD_RENDERERS = {ep_name: make_payload_renderer(ep_name) for ep_name in ENDPOINT_NAMES}
 
-def payload_signature(ep_name: str, payload: Any) -> str:
-    image_url = extract_image_url(payload) or ""
-    content = endpoint_message_content(ep_name, payload)
-    raw = f"{content}\n[image]{image_url}"
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
+def styled_payload_content(ep_name: str, payload: Any, for_auto: bool, epoch: Optional[int] = None) -> str:
+    renderer = _PAYLOAD_RENDERERS.get(ep_name)
+    if renderer is None:
+        renderer = make_payload_renderer(ep_name)
+    return renderer(payload, for_auto, epoch)
 
-async def upsert_endpoint_message(ep_name: str, payload: Dict[str, Any], channel_id: int) -> None:
-    cfg = bot.config.load()
+
+def endpoint_message_content(ep_name: str, payload: Dict[str, Any], epoch: Optional[int] = None) -> str:
+    return styled_payload_content(ep_name, payload, for_auto=True, epoch=epoch)
+
+
+# Channels missing from the gateway cache, kept so each tick does not repeat fetch_channel.
+# Entries are (channel, monotonic expiry); a deleted channel is dropped after the TTL.
+_FETCHED_CHANNELS: Dict[int, Tuple[Any, float]] = {}
+_FETCHED_CHANNELS_MAX = 256
+_FETCHED_CHANNEL_TTL_SECONDS = 600.0
+
+
+async def resolve_channel(channel_id: int) -> Optional[Any]:
+    channel = bot.get_channel(channel_id)
+    if channel is not None:
+        return channel
+    now = time.monotonic()
+    cached = _FETCHED_CHANNELS.get(channel_id)
+    if cached is not None:
+        if cached[1] > now:
+            return cached[0]
+        del _FETCHED_CHANNELS[channel_id]
+    try:
+        channel = await bot.fetch_channel(channel_id)
+    except Exception:  # noqa: BLE001
+        return None
+    if len(_FETCHED_CHANNELS) >= _FETCHED_CHANNELS_MAX:
+        _FETCHED_CHANNELS.pop(next(iter(_FETCHED_CHANNELS)))
+    _FETCHED_CHANNELS[channel_id] = (channel, now + _FETCHED_CHANNEL_TTL_SECONDS)
+    return channel
+
+
+# Tracked message ids fetched or sent since startup. Unchanged signatures skip the fetch
+# only for these: a message deleted while the bot was offline is found on the first pass.
+# Ids leave the set whenever their tracking entry is dropped, so it stays the size of the config.
+_VERIFIED_MESSAGE_IDS: Set[int] = set()
+
+
+def tracked_message_ids(cfg: Dict[str, Any]) -> Set[int]:
+    ids: Set[int] = set()
+    for key in ("auto_messages", "auto_news_messages", "auto_association_messages"):
+        for by_channel in cfg.get(key, {}).values():
+            if isinstance(by_channel, dict):
+                ids.update(mid for mid in by_channel.values() if type(mid) is int)
+    return ids
+
+
+def store_endpoint_tracking(ep_name: str, channel_key: str, message_id: int, signature: str) -> None:
+    # Re-read right before staging: other channels may have been stored while this one awaited Discord.
+    # Only the two tracking maps are copied, not the whole (possibly staged) config.
+    cfg = bot.config.subset("auto_messages", "auto_signatures")
     auto_messages = cfg.get("auto_messages", {})
     auto_signatures = cfg.get("auto_signatures", {})
-    if not isinstance(auto_messages, dict):
-        return
-    if not isinstance(auto_signatures, dict):
-        auto_signatures = {}
-
     endpoint_auto = endpoint_auto_messages(auto_messages, ep_name)
     endpoint_sign = endpoint_auto_signatures(auto_signatures, ep_name)
+    endpoint_auto[channel_key] = message_id
+    endpoint_sign[channel_key] = signature
+    auto_messages[ep_name] = endpoint_auto
+    auto_signatures[ep_name] = endpoint_sign
+    bot.mark_dirty({"auto_messages": auto_messages, "auto_signatures": auto_signatures})
+
+
+def merge_pass_changes(current: Dict[str, Any], before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    # Apply only the keys this pass added, edited or removed on top of the current map.
+    merged = dict(current)
+    for key in before.keys() | after.keys():
+        if key not in after:
+            merged.pop(key, None)
+        elif before.get(key) != after[key]:
+            merged[key] = after[key]
+    return merged
+
+
+def store_channel_tracking(
+    messages_key: str,
+    signatures_key: str,
+    channel_key: str,
+    before: Tuple[Dict[str, Any], Dict[str, Any]],
+    channel_messages: Dict[str, Any],
+    channel_signatures: Dict[str, Any],
+) -> None:
+    # The pass awaited Discord since it read `before`: entries forgotten meanwhile by
+    # on_raw_message_delete must stay forgotten, so merge instead of writing the map back.
+    cfg = bot.config.subset(messages_key, signatures_key)
+    messages = cfg.get(messages_key, {})
+    signatures = cfg.get(signatures_key, {})
+    current_messages = messages.get(channel_key)
+    current_signatures = signatures.get(channel_key)
+    messages[channel_key] = merge_pass_changes(
+        current_messages if isinstance(current_messages, dict) else {}, before[0], channel_messages
+    )
+    signatures[channel_key] = merge_pass_changes(
+        current_signatures if isinstance(current_signatures, dict) else {}, before[1], channel_signatures
+    )
+    bot.mark_dirty({messages_key: messages, signatures_key: signatures})
+
+
+def forget_tracked_messages(channel_id: int, message_ids: Set[int]) -> None:
+    # A tracked message deleted by hand: drop its entry so the next pass sends it again,
+    # since unchanged signatures of verified messages no longer fetch it from Discord.
+    _VERIFIED_MESSAGE_IDS.difference_update(message_ids)
+    cfg = bot.config.view()
+    channel_key = str(channel_id)
+    patch: Dict[str, Any] = {}
+
+    hit_endpoints = [
+        ep_name
+        for ep_name, by_channel in cfg.get("auto_messages", {}).items()
+        if isinstance(by_channel, dict) and by_channel.get(channel_key) in message_ids
+    ]
+    if hit_endpoints:
+        tracked = bot.config.subset("auto_messages", "auto_signatures")
+        auto_messages = tracked.get("auto_messages", {})
+        auto_signatures = tracked.get("auto_signatures", {})
+        for ep_name in hit_endpoints:
+            auto_messages[ep_name].pop(channel_key, None)
+            endpoint_sign = auto_signatures.get(ep_name)
+            if isinstance(endpoint_sign, dict):
+                endpoint_sign.pop(channel_key, None)
+        patch["auto_messages"] = auto_messages
+        patch["auto_signatures"] = auto_signatures
+
+    for messages_key, signatures_key in (
+        ("auto_news_messages", "auto_news_signatures"),
+        ("auto_association_messages", "auto_association_signatures"),
+    ):
+        channel_messages = cfg.get(messages_key, {}).get(channel_key)
+        if not isinstance(channel_messages, dict):
+            continue
+        stale_keys = [key for key, message_id in channel_messages.items() if message_id in message_ids]
+        if not stale_keys:
+            continue
+        channel_signatures = cfg.get(signatures_key, {}).get(channel_key)
+        channel_messages = dict(channel_messages)
+        channel_signatures = dict(channel_signatures) if isinstance(channel_signatures, dict) else {}
+        for key in stale_keys:
+            channel_messages.pop(key, None)
+            channel_signatures.pop(key, None)
+        messages = dict(cfg.get(messages_key, {}))
+        signatures = dict(cfg.get(signatures_key, {}))
+        messages[channel_key] = channel_messages
+        signatures[channel_key] = channel_signatures
+        patch[messages_key] = messages
+        patch[signatures_key] = signatures
+
+    if patch:
+        bot.mark_dirty(patch)
+
+
+async def upsert_endpoint_message(ep_name: str, payload: Dict[str, Any], channel_id: int) -> bool:
+    # Tracking maps are canonical after reconcile_config_state (str channel keys, int ids):
+    # look up this channel directly instead of re-normalizing every channel of the endpoint.
+    cfg = bot.config.view()
+    channel_key = str(channel_id)
+    endpoint_auto = cfg.get("auto_messages", {}).get(ep_name)
+    endpoint_sign = cfg.get("auto_signatures", {}).get(ep_name)
+    message_id = endpoint_auto.get(channel_key) if isinstance(endpoint_auto, dict) else None
+    old_signature = endpoint_sign.get(channel_key) if isinstance(endpoint_sign, dict) else None
 
     content = endpoint_message_content(ep_name, payload)
-    embed = build_image_embed(ep_name, payload, for_auto=True)
-    new_signature = payload_signature(ep_name, payload)
-    channel = bot.get_channel(int(channel_id))
+    image_url = extract_image_url(payload) or ""
+    embed = image_embed(ep_name, image_url, for_auto=True)
+    new_signature = payload_signature(content, image_url)
+    unchanged = bool(message_id) and old_signature == new_signature
+    # Unchanged payload of a message already seen since startup: skip every Discord round-trip.
+    if unchanged and message_id in _VERIFIED_MESSAGE_IDS:
+        return True
+
+    channel = await resolve_channel(channel_id)
     if channel is None:
-        try:
-            channel = await bot.fetch_channel(int(channel_id))
-        except Exception:  # noqa: BLE001
-            return
+        return False
 
-    message_id = endpoint_auto.get(str(channel_id))
     if message_id:
         try:
-            msg = await channel.fetch_message(int(message_id))
-            if endpoint_sign.get(str(channel_id)) == new_signature:
-                return
-            await msg.edit(content=content, embed=embed)
-            endpoint_sign[str(channel_id)] = new_signature
-            auto_messages[ep_name] = endpoint_auto
-            auto_signatures[ep_name] = endpoint_sign
-            bot.config.update({"auto_messages": auto_messages, "auto_signatures": auto_signatures})
-            return
+            msg = await channel.fetch_message(message_id)
+            if not unchanged:
+                await msg.edit(content=content, embed=embed)
+                store_endpoint_tracking(ep_name, channel_key, message_id, new_signature)
+            _VERIFIED_MESSAGE_IDS.add(message_id)
+            return True
         except Exception:  # noqa: BLE001
             pass
 
     try:
         msg = await channel.send(content=content, embed=embed)
-        endpoint_auto[str(channel_id)] = msg.id
-        endpoint_sign[str(channel_id)] = new_signature
     except Exception:  # noqa: BLE001
-        return
+        return False
+    _VERIFIED_MESSAGE_IDS.discard(message_id)
+    _VERIFIED_MESSAGE_IDS.add(msg.id)
+    store_endpoint_tracking(ep_name, channel_key, msg.id, new_signature)
+    return True
 
-    auto_messages[ep_name] = endpoint_auto
-    auto_signatures[ep_name] = endpoint_sign
-    bot.config.update({"auto_messages": auto_messages, "auto_signatures": auto_signatures})
 
+async def sync_keyed_messages(
+    channel_id: int,
+    channel: Any,
+    rendered: Dict[str, Tuple[str, Optional[discord.Embed], str]],
+    channel_messages: Dict[str, Any],
+    channel_signatures: Dict[str, Any],
+) -> bool:
+    semaphore = asyncio.Semaphore(UPSERT_CONCURRENCY)
 
-async def upsert_news_messages(payload: Any, channel_id: int) -> None:
-    cfg = bot.config.load()
+    async def edit(key: str, content: str, embed: Optional[discord.Embed], signature: str) -> bool:
+        async with semaphore:
+            try:
+                msg = await channel.fetch_message(int(channel_messages[key]))
+                if channel_signatures.get(key) != signature:
+                    await msg.edit(content=content, embed=embed)
+            except Exception:  # noqa: BLE001
+                return False
+        _VERIFIED_MESSAGE_IDS.add(msg.id)
+        channel_signatures[key] = signature
+        return True
+
+    # Edits of changed messages overlap; unchanged ones were filtered out by signature,
+    # unless not fetched yet since startup (they may have been deleted while offline).
+    to_edit = [
+        (key, entry)
+        for key, entry in rendered.items()
+        if channel_messages.get(key)
+        and (channel_signatures.get(key) != entry[2] or channel_messages[key] not in _VERIFIED_MESSAGE_IDS)
+    ]
+    results = await asyncio.gather(*(edit(key, *entry) for key, entry in to_edit))
+    failed = {key for (key, _), ok in zip(to_edit, results) if not ok}
+
+    # Sends stay sequential so new messages keep the payload order in the channel.
+    delivered = True
+    for key, (content, embed, signature) in rendered.items():
+        if channel_messages.get(key) and key not in failed:
+            continue
+        try:
+            msg = await channel.send(content=content, embed=embed)
+        except Exception:  # noqa: BLE001
+            delivered = False
+            continue
+        if channel_messages.get(key):
+            # Replaces a message that could not be edited.
+            _VERIFIED_MESSAGE_IDS.discard(channel_messages[key])
+        _VERIFIED_MESSAGE_IDS.add(msg.id)
+        channel_messages[key] = msg.id
+        channel_signatures[key] = signature
+
+    stale_ids: List[int] = []
+    for stale_key in channel_messages.keys() - rendered.keys():
+        stale_msg_id = channel_messages.pop(stale_key, None)
+        channel_signatures.pop(stale_key, None)
+        if not stale_msg_id:
+            continue
+        try:
+            stale_ids.append(int(stale_msg_id))
+        except (TypeError, ValueError):
+            continue
+    await remove_tracked_messages(channel_id, stale_ids)
+    return delivered
+
+
+async def upsert_news_messages(payload: Any, channel_id: int) -> bool:
+    cfg = bot.config.view()
     auto_news_messages = cfg.get("auto_news_messages", {})
     auto_news_signatures = cfg.get("auto_news_signatures", {})
-    if not isinstance(auto_news_messages, dict):
-        auto_news_messages = {}
-    if not isinstance(auto_news_signatures, dict):
-        auto_news_signatures = {}
 
     channel_key = str(channel_id)
     channel_messages = auto_news_messages.get(channel_key, {})
     channel_signatures = auto_news_signatures.get(channel_key, {})
-    if not isinstance(channel_messages, dict):
-        channel_messages = {}
-    if not isinstance(channel_signatures, dict):
-        channel_signatures = {}
+    # Flat key -> id/signature maps: a shallow copy detaches them from the shared config.
+    channel_messages = dict(channel_messages) if isinstance(channel_messages, dict) else {}
+    channel_signatures = dict(channel_signatures) if isinstance(channel_signatures, dict) else {}
+    before = (dict(channel_messages), dict(channel_signatures))
 
-    channel = bot.get_channel(channel_id)
+    channel = await resolve_channel(channel_id)
     if channel is None:
-        try:
-            channel = await bot.fetch_channel(channel_id)
-        except Exception:  # noqa: BLE001
-            return
+        return False
 
     raw_items = extract_items(payload) or []
     items = [it for it in raw_items if isinstance(it, dict)]
-    active_keys: List[str] = []
+    rendered: Dict[str, Tuple[str, Optional[discord.Embed], str]] = {}
+    epoch = int(time.time())
 
     for idx, item in enumerate(items, start=1):
         key = news_item_key(item, idx)
-        active_keys.append(key)
-        content = news_message_content(item, idx, for_auto=True)
-        embed = build_image_embed("news", item, for_auto=True)
-        signature = news_message_signature(item, idx, for_auto=True)
+        content = news_message_content(item, idx, for_auto=True, epoch=epoch)
+        image_url = extract_image_url(item) or ""
+        embed = image_embed("news", image_url, for_auto=True)
+        signature = payload_signature(content, image_url)
+        rendered[key] = (content, embed, signature)
 
-        message_id = channel_messages.get(key)
-        if message_id:
-            try:
-                msg = await channel.fetch_message(int(message_id))
-                if channel_signatures.get(key) != signature:
-                    await msg.edit(content=content, embed=embed)
-                    channel_signatures[key] = signature
-                continue
-            except Exception:  # noqa: BLE001
-                pass
-
-        try:
-            msg = await channel.send(content=content, embed=embed)
-            channel_messages[key] = msg.id
-            channel_signatures[key] = signature
-        except Exception:  # noqa: BLE001
-            continue
-
-    stale_keys = [k for k in list(channel_messages.keys()) if k not in active_keys]
-    for stale_key in stale_keys:
-        stale_msg_id = channel_messages.get(stale_key)
-        if stale_msg_id:
-            try:
-                msg = await channel.fetch_message(int(stale_msg_id))
-                await msg.delete()
-            except Exception:  # noqa: BLE001
-                pass
-        channel_messages.pop(stale_key, None)
-        channel_signatures.pop(stale_key, None)
+    delivered = await sync_keyed_messages(channel_id, channel, rendered, channel_messages, channel_signatures)
 
-    auto_news_messages[channel_key] = channel_messages
-    auto_news_signatures[channel_key] = channel_signatures
-    bot.config.update({"auto_news_messages": auto_news_messages, "auto_news_signatures": auto_news_signatures})
+    store_channel_tracking(
+        "auto_news_messages", "auto_news_signatures", channel_key, before, channel_messages, channel_signatures
+    )
+    return delivered
 
 
-async def upsert_association_messages(payload: Any, channel_id: int) -> None:
-    cfg = bot.config.load()
+async def upsert_association_messages(payload: Any, channel_id: int) -> bool:
+    cfg = bot.config.view()
     auto_association_messages = cfg.get("auto_association_messages", {})
     auto_association_signatures = cfg.get("auto_association_signatures", {})
-    if not isinstance(auto_association_messages, dict):
-        auto_association_messages = {}
-    if not isinstance(auto_association_signatures, dict):
-        auto_association_signatures = {}
 
     channel_key = str(channel_id)
     channel_messages = auto_association_messages.get(channel_key, {})
     channel_signatures = auto_association_signatures.get(channel_key, {})
-    if not isinstance(channel_messages, dict):
-        channel_messages = {}
-    if not isinstance(channel_signatures, dict):
-        channel_signatures = {}
+    # Flat key -> id/signature maps: a shallow copy detaches them from the shared config.
+    channel_messages = dict(channel_messages) if isinstance(channel_messages, dict) else {}
+    channel_signatures = dict(channel_signatures) if isinstance(channel_signatures, dict) else {}
+    before = (dict(channel_messages), dict(channel_signatures))
 
-    channel = bot.get_channel(channel_id)
+    channel = await resolve_channel(channel_id)
     if channel is None:
-        try:
-            channel = await bot.fetch_channel(channel_id)
-        except Exception:  # noqa: BLE001
-            return
+        return False
 
     sections = association_sections(payload)
-    active_keys: List[str] = []
+    rendered: Dict[str, Tuple[str, Optional[discord.Embed], str]] = {}
+    epoch = int(time.time())
 
     for section_name, section_value in sections.items():
         key = section_name
-        active_keys.append(key)
-        content = association_section_content(section_name, section_value, for_auto=True)
-        embed = build_image_embed("association", section_value, for_auto=True)
-        signature = association_section_signature(section_name, section_value, for_auto=True)
+        content = association_section_content(section_name, section_value, for_auto=True, epoch=epoch)
+        image_url = extract_image_url(section_value) or ""
+        embed = image_embed("association", image_url, for_auto=True)
+        signature = payload_signature(content, image_url)
+        rendered[key] = (content, embed, signature)
+
+    delivered = await sync_keyed_messages(channel_id, channel, rendered, channel_messages, channel_signatures)
+
+    store_channel_tracking(
+        "auto_association_messages",
+        "auto_association_signatures",
+        channel_key,
+        before,
+        channel_messages,
+        channel_signatures,
+    )
+    return delivered
 
-        message_id = channel_messages.get(key)
-        if message_id:
-            try:
-                msg = await channel.fetch_message(int(message_id))
-                if channel_signatures.get(key) != signature:
-                    await msg.edit(content=content, embed=embed)
-                    channel_signatures[key] = signature
-                continue
-            except Exception:  # noqa: BLE001
-                pass
 
-        try:
-            msg = await channel.send(content=content, embed=embed)
-            channel_messages[key] = msg.id
-            channel_signatures[key] = signature
-        except Exception:  # noqa: BLE001
-            continue
+async def upsert_channel_payload(ep_name: str, payload: Any, channel_id: int) -> bool:
+    if ep_name == "news":
+        return await upsert_news_messages(payload, channel_id)
+    if ep_name == "association":
+        return await upsert_association_messages(payload, channel_id)
+    return await upsert_endpoint_message(ep_name, payload, channel_id)
 
-    stale_keys = [k for k in list(channel_messages.keys()) if k not in active_keys]
-    for stale_key in stale_keys:
-        stale_msg_id = channel_messages.get(stale_key)
-        if stale_msg_id:
-            try:
-                msg = await channel.fetch_message(int(stale_msg_id))
-                await msg.delete()
-            except Exception:  # noqa: BLE001
-                pass
-        channel_messages.pop(stale_key, None)
-        channel_signatures.pop(stale_key, None)
 
-    auto_association_messages[channel_key] = channel_messages
-    auto_association_signatures[channel_key] = channel_signatures
-    bot.config.update(
-        {
-            "auto_association_messages": auto_association_messages,
-            "auto_association_signatures": auto_association_signatures,
-        }
-    )
+# (endpoint, channels) -> (config generation the last full pass started from, response digest).
+# Any config change (admin command or tracked message update) bumps the generation.
+_LAST_PAYLOAD_DIGESTS: Dict[Tuple[str, Tuple[int, ...]], Tuple[int, bytes]] = {}
 
 
-async def auto_refresh_endpoint_channel(ep_name: str, channel_id: int) -> int:
+async def auto_refresh_endpoint(ep_name: str, channel_ids: List[int]) -> int:
+    targets = ", ".join(str(cid) for cid in channel_ids)
+    job_key = (ep_name, tuple(channel_ids))
+    # Read before any await: a forget or !clear staged during the pass must not be
+    # folded into the recorded generation, or the next pass would skip and hide it.
+    generation = bot.config.generation
     try:
         cfg = build_request_config()
         path = endpoint_path(ep_name)
-        print(f"[auto-refresh] Request {ep_name} -> channel {channel_id}")
-        payload = await bot.api_client.get_json(cfg["base_url"], path, cfg["api_key"], {})
-        if ep_name == "news":
-            await upsert_news_messages(payload, channel_id)
-        elif ep_name == "association":
-            await upsert_association_messages(payload, channel_id)
+        print(f"[auto-refresh] Request {ep_name} -> channel {targets}")
+        payload, digest = await bot.api_client.get_json_digest(cfg["base_url"], path, cfg["api_key"], {})
+
+        previous = _LAST_PAYLOAD_DIGESTS.get(job_key)
+        if previous is not None and previous[0] == generation and previous[1] == digest:
+            print(f"[auto-refresh] Unchanged {ep_name} -> channel {targets}")
+            return max(1, math.ceil(bot.api_client.cooldown_remaining()))
+
+        # One API call feeds every channel; channels have separate Discord rate limits.
+        results = await asyncio.gather(
+            *(upsert_channel_payload(ep_name, payload, cid) for cid in channel_ids),
+            return_exceptions=True,
+        )
+        failed = False
+        for cid, result in zip(channel_ids, results):
+            if isinstance(result, Exception):
+                failed = True
+                print(f"[auto-refresh] Unexpected error on {ep_name} -> channel {cid}")
+            elif not result:
+                failed = True
+        if failed:
+            _LAST_PAYLOAD_DIGESTS.pop(job_key, None)
         else:
-            await upsert_endpoint_message(ep_name, payload, channel_id)
-        print(f"[auto-refresh] Done {ep_name} -> channel {channel_id}")
-        return 60
+            _LAST_PAYLOAD_DIGESTS[job_key] = (generation, digest)
+        print(f"[auto-refresh] Done {ep_name} -> channel {targets}")
+        # Read after the Discord updates: the caller sleeps this long, and the bucket kept
+        # refilling meanwhile, so the next request still fires one interval after this one.
+        return max(1, math.ceil(bot.api_client.cooldown_remaining()))
     except ApiRateLimitError as exc:
         print(f"[auto-refresh] Cooldown local {ep_name}: {exc.remaining_seconds}s")
         return max(1, exc.remaining_seconds)
@@ -1036,21 +1457,36 @@ async def auto_refresh_endpoint_channel(ep_name: str, channel_id: int) -> int:
         return 60
 
 
+# (config generation the jobs were computed from, jobs); any config change bumps it.
+_refresh_jobs_cache: Tuple[Optional[int], List[tuple[str, int]]] = (None, [])
+
+
 def build_refresh_jobs() -> List[tuple[str, int]]:
-    cfg = bot.config.load()
+    global _refresh_jobs_cache
+    generation = bot.config.generation
+    cached_generation, cached_jobs = _refresh_jobs_cache
+    if cached_generation == generation:
+        return list(cached_jobs)
+
+    cfg = bot.config.view()
+
     enabled = cfg.get("auto_enabled_endpoints", [])
     channels = cfg.get("channels", {})
-    if not isinstance(enabled, list):
-        enabled = []
-    if not isinstance(channels, dict):
-        channels = {}
 
-    valid_enabled = [ep for ep in enabled if ep in ENDPOINT_NAMES]
+    valid_enabled = [ep for ep in enabled if ep in ENDPOINT_NAME_SET]
     jobs: List[tuple[str, int]] = []
     for ep_name in valid_enabled:
         for channel_id in endpoint_channel_ids(channels, ep_name):
             jobs.append((ep_name, channel_id))
-    return jobs
+    _refresh_jobs_cache = (generation, jobs)
+    return list(jobs)
+
+
+def group_refresh_jobs(jobs: List[tuple[str, int]]) -> List[Tuple[str, List[int]]]:
+    grouped: Dict[str, List[int]] = {}
+    for ep_name, channel_id in jobs:
+        grouped.setdefault(ep_name, []).append(channel_id)
+    return list(grouped.items())
 
 
 async def auto_refresh_worker() -> None:
@@ -1061,10 +1497,10 @@ async def auto_refresh_worker() -> None:
             await asyncio.sleep(10)
             continue
 
-        for ep_name, channel_id in jobs:
+        for ep_name, channel_ids in group_refresh_jobs(jobs):
             if bot.is_closed():
                 return
-            delay = await auto_refresh_endpoint_channel(ep_name, channel_id)
+            delay = await auto_refresh_endpoint(ep_name, channel_ids)
             await asyncio.sleep(max(1, delay))
 
 
@@ -1142,8 +1578,22 @@ async def on_ready() -> None:
     print(f"Bot pret: {bot.user}")
 
 
+@bot.event
+async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent) -> None:
+    forget_tracked_messages(payload.channel_id, {payload.message_id})
+
+
+@bot.event
+async def on_raw_bulk_message_delete(payload: discord.RawBulkMessageDeleteEvent) -> None:
+    forget_tracked_messages(payload.channel_id, set(payload.message_ids))
+
+
 @bot.event
 async def on_command_error(ctx: commands.Context, error: commands.CommandError) -> None:
+    # Single handler for every command: per-command handlers ran in addition to this one.
+    if isinstance(error, commands.MissingPermissions):
+        await ctx.send("Commande reservee aux administrateurs.")
+        return
     if isinstance(error, commands.CheckFailure):
         await ctx.send("Acces refuse: ce bot est reserve aux administrateurs du serveur.")
         return
@@ -1192,7 +1642,7 @@ async def help_cmd(ctx: commands.Context) -> None:
             "`!events [k=v ...]`\n"
             "Format filtres: `cle=valeur` separes par espace.\n"
             "Exemple: `!news limit=5 lang=fr`\n"
-            "Cooldown global API: 1 requete / 60 secondes."
+            "Cooldown global API: 1 requete / 60 secondes (plus jusqu'a 3 relances si l'API repond 429)."
         ),
     ]
     for part in parts:
@@ -1208,7 +1658,8 @@ async def set_base_url(ctx: commands.Context, url: str) -> None:
         await ctx.send(str(exc))
         return
 
-    bot.config.update({"base_url": final_url})
+    bot.mark_dirty({"base_url": final_url})
+    await bot.flush_config()
     await ctx.send(f"Base URL enregistree: `{final_url}`")
 
 
@@ -1224,13 +1675,12 @@ async def set_channel(ctx: commands.Context, endpoint: str, channel: discord.Tex
 
     cfg = bot.config.load()
     channels = cfg.get("channels", {})
-    if not isinstance(channels, dict):
-        channels = {}
     ids = endpoint_channel_ids(channels, endpoint_name)
     if channel.id not in ids:
         ids.append(channel.id)
     channels[endpoint_name] = ids
     save_reconciled_config({"channels": channels})
+    await bot.flush_config()
     await ctx.send(f"Salon {channel.mention} associe a `{endpoint_name}`.")
 
 
@@ -1244,7 +1694,15 @@ async def unset_channel(ctx: commands.Context, endpoint: str, channel: Optional[
         await ctx.send(str(exc))
         return
 
-    cfg = bot.config.load()
+    cfg = bot.config.subset(
+        "channels",
+        "auto_messages",
+        "auto_signatures",
+        "auto_news_messages",
+        "auto_news_signatures",
+        "auto_association_messages",
+        "auto_association_signatures",
+    )
     channels = normalize_channels(cfg.get("channels", {}))
     auto_messages = cfg.get("auto_messages", {})
     auto_signatures = cfg.get("auto_signatures", {})
@@ -1252,18 +1710,6 @@ async def unset_channel(ctx: commands.Context, endpoint: str, channel: Optional[
     auto_news_signatures = cfg.get("auto_news_signatures", {})
     auto_association_messages = cfg.get("auto_association_messages", {})
     auto_association_signatures = cfg.get("auto_association_signatures", {})
-    if not isinstance(auto_messages, dict):
-        auto_messages = {}
-    if not isinstance(auto_signatures, dict):
-        auto_signatures = {}
-    if not isinstance(auto_news_messages, dict):
-        auto_news_messages = {}
-    if not isinstance(auto_news_signatures, dict):
-        auto_news_signatures = {}
-    if not isinstance(auto_association_messages, dict):
-        auto_association_messages = {}
-    if not isinstance(auto_association_signatures, dict):
-        auto_association_signatures = {}
     existing_ids = endpoint_channel_ids(channels, endpoint_name)
     if not existing_ids:
         await ctx.send(f"Aucune association configuree pour `{endpoint_name}`.")
@@ -1297,6 +1743,7 @@ async def unset_channel(ctx: commands.Context, endpoint: str, channel: Optional[
                 "auto_association_signatures": auto_association_signatures,
             }
         )
+        await bot.flush_config()
         await ctx.send(f"Tous les salons ont ete retires pour `{endpoint_name}`.")
         return
 
@@ -1337,15 +1784,14 @@ async def unset_channel(ctx: commands.Context, endpoint: str, channel: Optional[
             "auto_association_signatures": auto_association_signatures,
         }
     )
+    await bot.flush_config()
     await ctx.send(f"Salon {channel.mention} retire de `{endpoint_name}`.")
 
 
 @bot.command(name="show_channels")
 async def show_channels(ctx: commands.Context) -> None:
-    cfg = bot.config.load()
+    cfg = bot.config.view()
     channels = cfg.get("channels", {})
-    if not isinstance(channels, dict):
-        channels = {}
 
     lines = []
     for name in ENDPOINT_NAMES:
@@ -1358,9 +1804,7 @@ async def show_channels(ctx: commands.Context) -> None:
 def set_endpoint_auto_state(endpoint_name: str, enabled_state: bool) -> str:
     cfg = save_reconciled_config()
     enabled = cfg.get("auto_enabled_endpoints", [])
-    if not isinstance(enabled, list):
-        enabled = []
-    enabled = [ep for ep in enabled if ep in ENDPOINT_NAMES]
+    enabled = [ep for ep in enabled if ep in ENDPOINT_NAME_SET]
 
     if enabled_state and endpoint_name not in enabled:
         enabled.append(endpoint_name)
@@ -1382,11 +1826,12 @@ async def enable_endpoint(ctx: commands.Context, endpoint: str) -> None:
     except ValueError as exc:
         await ctx.send(str(exc))
         return
-    channels = bot.config.load().get("channels", {})
+    channels = bot.config.view().get("channels", {})
     if not isinstance(channels, dict) or not endpoint_channel_ids(channels, endpoint_name):
         await ctx.send(f"Associe d'abord un salon: `!set_channel {endpoint_name} #salon`.")
         return
     state = set_endpoint_auto_state(endpoint_name, True)
+    await bot.flush_config()
     await ctx.send(f"Auto-affichage actif pour `{endpoint_name}`. Endpoints actifs: {state}")
 
 
@@ -1400,6 +1845,7 @@ async def disable_endpoint(ctx: commands.Context, endpoint: str) -> None:
         await ctx.send(str(exc))
         return
     state = set_endpoint_auto_state(endpoint_name, False)
+    await bot.flush_config()
     await ctx.send(f"Auto-affichage desactive pour `{endpoint_name}`. Endpoints actifs: {state}")
 
 
@@ -1414,10 +1860,8 @@ async def enable_news(ctx: commands.Context) -> None:
 async def enable_all_endpoints(ctx: commands.Context) -> None:
     if not await ensure_api_key_or_warn(ctx):
         return
-    cfg = bot.config.load()
+    cfg = bot.config.view()
     channels = cfg.get("channels", {})
-    if not isinstance(channels, dict):
-        channels = {}
 
     enabled_now = []
     missing_channels = []
@@ -1428,6 +1872,7 @@ async def enable_all_endpoints(ctx: commands.Context) -> None:
         else:
             missing_channels.append(endpoint_name)
 
+    await bot.flush_config()
     if not enabled_now:
         await ctx.send("Aucun endpoint active: configure d'abord des salons avec `!set_channel <endpoint> #salon`.")
         return
@@ -1446,11 +1891,9 @@ async def disable_news(ctx: commands.Context) -> None:
 
 @bot.command(name="auto_status")
 async def auto_status(ctx: commands.Context) -> None:
-    cfg = bot.config.load()
+    cfg = bot.config.view()
     enabled = cfg.get("auto_enabled_endpoints", [])
-    if not isinstance(enabled, list):
-        enabled = []
-    enabled = [ep for ep in enabled if ep in ENDPOINT_NAMES]
+    enabled = [ep for ep in enabled if ep in ENDPOINT_NAME_SET]
     jobs = build_refresh_jobs()
     lines = [f"- `{ep}`" for ep in enabled] if enabled else ["- (aucun)"]
     await ctx.send(
@@ -1475,11 +1918,14 @@ async def refresh_all_now(ctx: commands.Context) -> None:
 
     await ctx.send(
         f"Mise a jour forcee lancee pour {len(jobs)} job(s) endpoint/salon. "
-        "Le bot respecte 1 requete/60s, donc cela peut prendre plusieurs minutes."
+        "Le bot respecte 1 requete/60s (plus les relances sur 429), donc cela peut prendre plusieurs minutes."
     )
-    for ep_name, channel_id in jobs:
-        delay = await auto_refresh_endpoint_channel(ep_name, channel_id)
-        await asyncio.sleep(max(1, delay))
+    grouped = group_refresh_jobs(jobs)
+    for index, (ep_name, channel_ids) in enumerate(grouped):
+        delay = await auto_refresh_endpoint(ep_name, channel_ids)
+        # The cooldown only matters before another request; do not hold the reply after the last one.
+        if index < len(grouped) - 1:
+            await asyncio.sleep(max(1, delay))
     await ctx.send("Mise a jour forcee terminee.")
 
 
@@ -1496,15 +1942,45 @@ def parse_channel_target(ctx: commands.Context, token: str) -> Optional[int]:
     return None
 
 
-async def remove_tracked_message(channel_id: int, message_id: int) -> bool:
-    channel = bot.get_channel(int(channel_id))
+def bulk_deletable(message_id: int, now_ms: int) -> bool:
+    # Discord refuses bulk deletion of messages older than 14 days; keep a minute of margin.
+    created_ms = (message_id >> 22) + DISCORD_EPOCH_MS
+    return now_ms - created_ms < BULK_DELETE_MAX_AGE_MS - 60_000
+
+
+async def remove_tracked_messages(channel_id: int, message_ids: List[int]) -> int:
+    if not message_ids:
+        return 0
+    # Their tracking entries are dropped by the callers.
+    _VERIFIED_MESSAGE_IDS.difference_update(message_ids)
+    channel = await resolve_channel(channel_id)
     if channel is None:
-        try:
-            channel = await bot.fetch_channel(int(channel_id))
-        except Exception:  # noqa: BLE001
-            return False
+        return 0
+
+    message_ids = list(dict.fromkeys(message_ids))
+    now_ms = int(time.time() * 1000)
+    recent = [mid for mid in message_ids if bulk_deletable(mid, now_ms)]
+    single = [mid for mid in message_ids if not bulk_deletable(mid, now_ms)]
+    deleted = 0
+    if hasattr(channel, "delete_messages"):
+        for start in range(0, len(recent), 100):
+            chunk = recent[start : start + 100]
+            try:
+                await channel.delete_messages([discord.Object(id=mid) for mid in chunk])
+                deleted += len(chunk)
+            except Exception:  # noqa: BLE001
+                single.extend(chunk)
+    else:
+        single.extend(recent)
+
+    # discord.py queues these on the route's rate-limit bucket; gathering just overlaps the waits.
+    results = await asyncio.gather(*(remove_tracked_message(channel, mid) for mid in single))
+    return deleted + sum(results)
+
+
+async def remove_tracked_message(channel: Any, message_id: int) -> bool:
     try:
-        msg = await channel.fetch_message(int(message_id))
+        msg = await channel.fetch_message(message_id)
         await msg.delete()
         return True
     except Exception:  # noqa: BLE001
@@ -1514,45 +1990,48 @@ async def remove_tracked_message(channel_id: int, message_id: int) -> bool:
 @bot.command(name="clear")
 @commands.has_permissions(administrator=True)
 async def clear(ctx: commands.Context, target: str) -> None:
-    cfg = bot.config.load()
+    cfg = bot.config.subset(
+        "auto_messages",
+        "auto_signatures",
+        "auto_news_messages",
+        "auto_news_signatures",
+        "auto_association_messages",
+        "auto_association_signatures",
+    )
     auto_messages = cfg.get("auto_messages", {})
     auto_signatures = cfg.get("auto_signatures", {})
     auto_news_messages = cfg.get("auto_news_messages", {})
     auto_news_signatures = cfg.get("auto_news_signatures", {})
     auto_association_messages = cfg.get("auto_association_messages", {})
     auto_association_signatures = cfg.get("auto_association_signatures", {})
-    if not isinstance(auto_messages, dict):
-        auto_messages = {}
-    if not isinstance(auto_signatures, dict):
-        auto_signatures = {}
-    if not isinstance(auto_news_messages, dict):
-        auto_news_messages = {}
-    if not isinstance(auto_news_signatures, dict):
-        auto_news_signatures = {}
-    if not isinstance(auto_association_messages, dict):
-        auto_association_messages = {}
-    if not isinstance(auto_association_signatures, dict):
-        auto_association_signatures = {}
 
     deleted = 0
     target_lower = target.lower()
 
     if target_lower == "all":
+        # Group by channel so each one gets a single bulk delete.
+        by_channel: Dict[int, List[int]] = {}
         for ep_name in ENDPOINT_NAMES:
             endpoint_auto = endpoint_auto_messages(auto_messages, ep_name)
             for channel_id_str, message_id in endpoint_auto.items():
-                if await remove_tracked_message(int(channel_id_str), int(message_id)):
-                    deleted += 1
-        for channel_key, by_news in list(auto_news_messages.items()):
+                by_channel.setdefault(int(channel_id_str), []).append(int(message_id))
+        for channel_key, by_news in auto_news_messages.items():
             if isinstance(by_news, dict):
-                for _, message_id in by_news.items():
-                    if await remove_tracked_message(int(channel_key), int(message_id)):
-                        deleted += 1
-        for channel_key, by_assoc in list(auto_association_messages.items()):
+                by_channel.setdefault(int(channel_key), []).extend(int(mid) for mid in by_news.values())
+        for channel_key, by_assoc in auto_association_messages.items():
             if isinstance(by_assoc, dict):
-                for _, message_id in by_assoc.items():
-                    if await remove_tracked_message(int(channel_key), int(message_id)):
-                        deleted += 1
+                by_channel.setdefault(int(channel_key), []).extend(int(mid) for mid in by_assoc.values())
+
+        # Channels are purged concurrently, but bounded so a large deployment does not
+        # queue hundreds of requests against the global Discord limit at once.
+        semaphore = asyncio.Semaphore(PURGE_CONCURRENCY)
+
+        async def purge(tracked_channel_id: int, ids: List[int]) -> int:
+            async with semaphore:
+                return await remove_tracked_messages(tracked_channel_id, ids)
+
+        counts = await asyncio.gather(*(purge(cid, ids) for cid, ids in by_channel.items()))
+        deleted += sum(counts)
 
         save_reconciled_config(
             {
@@ -1564,6 +2043,7 @@ async def clear(ctx: commands.Context, target: str) -> None:
                 "auto_association_signatures": {},
             }
         )
+        await bot.flush_config()
         await ctx.send(
             f"Clear termine: {deleted} message(s) supprime(s). "
             "Seules les donnees de suivi des messages ont ete nettoyees."
@@ -1576,12 +2056,13 @@ async def clear(ctx: commands.Context, target: str) -> None:
         return
 
     channel_key = str(channel_id)
+    message_ids: List[int] = []
     for ep_name in ENDPOINT_NAMES:
         endpoint_auto = endpoint_auto_messages(auto_messages, ep_name)
         endpoint_sign = endpoint_auto_signatures(auto_signatures, ep_name)
         msg_id = endpoint_auto.get(channel_key)
-        if msg_id and await remove_tracked_message(channel_id, int(msg_id)):
-            deleted += 1
+        if msg_id:
+            message_ids.append(int(msg_id))
         endpoint_auto.pop(channel_key, None)
         endpoint_sign.pop(channel_key, None)
         if endpoint_auto:
@@ -1595,15 +2076,13 @@ async def clear(ctx: commands.Context, target: str) -> None:
 
     by_news = auto_news_messages.get(channel_key, {})
     if isinstance(by_news, dict):
-        for _, message_id in by_news.items():
-            if await remove_tracked_message(channel_id, int(message_id)):
-                deleted += 1
+        message_ids.extend(int(message_id) for message_id in by_news.values())
 
     by_assoc = auto_association_messages.get(channel_key, {})
     if isinstance(by_assoc, dict):
-        for _, message_id in by_assoc.items():
-            if await remove_tracked_message(channel_id, int(message_id)):
-                deleted += 1
+        message_ids.extend(int(message_id) for message_id in by_assoc.values())
+
+    deleted += await remove_tracked_messages(channel_id, message_ids)
 
     auto_news_messages.pop(channel_key, None)
     auto_news_signatures.pop(channel_key, None)
@@ -1620,6 +2099,7 @@ async def clear(ctx: commands.Context, target: str) -> None:
             "auto_association_signatures": auto_association_signatures,
         }
     )
+    await bot.flush_config()
     await ctx.send(
         f"Clear termine pour <#{channel_id}>: {deleted} message(s) supprime(s). "
         "Seules les donnees liees a ces messages ont ete nettoyees."
@@ -1636,55 +2116,108 @@ async def reboot(ctx: commands.Context) -> None:
 
 
 def get_autostart_script_path() -> str:
-    return os.path.join(os.path.dirname(os.path.abspath(__file__)), AUTOSTART_SCRIPT_RELATIVE_PATH)
+    return AUTOSTART_SCRIPT_PATH
 
 
 def get_update_delay_file_path() -> str:
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    base_dir = os.path.dirname(script_dir)
-    return os.path.join(base_dir, UPDATE_DELAY_FILE_NAME)
+    return UPDATE_DELAY_FILE_PATH
 
 
-def read_update_delay_minutes_from_file() -> Optional[int]:
-    path = get_update_delay_file_path()
-    if not os.path.isfile(path):
-        return None
+def write_text_file_if_changed(path: str, text: str) -> None:
+    # Compared against the file itself, never the read cache, so a real change is never skipped.
     try:
-        raw = open(path, "r", encoding="utf-8").read().strip()
-        value = int(raw)
-        if value >= 1:
-            return value
+        with open(path, "r", encoding="utf-8", newline="") as file_obj:
+            if file_obj.read(len(text) + 1) == text:
+                return
+    except (OSError, ValueError):
+        pass
+    write_text_file(path, text)
+
+
+def write_text_file(path: str, text: str) -> None:
+    # Swapped in whole like the config: the update script never reads a half-written value.
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        mode = 0o644
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(text.encode("utf-8"))
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+# path -> (st_mtime_ns, st_size, parsed value) of the last successful read.
+_SIDECAR_CACHE: Dict[str, Tuple[int, int, Any]] = {}
+
+
+def read_sidecar_file(path: str, parse: Callable[[str], Any], default: Any) -> Any:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return default
+    try:
+        # Key on the opened file itself, not on a stat taken before the open.
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode):
+            return default
+        cached = _SIDECAR_CACHE.get(path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        raw = os.read(fd, st.st_size)
+        after = os.fstat(fd)
+    except OSError:
+        return default
+    finally:
+        os.close(fd)
+    try:
+        value = parse(raw.decode("utf-8"))
     except Exception:  # noqa: BLE001
-        return None
-    return None
+        return default
+    # Rewritten in place while being read: use the value but do not cache it.
+    if (after.st_mtime_ns, after.st_size) == (st.st_mtime_ns, st.st_size):
+        _SIDECAR_CACHE[path] = (st.st_mtime_ns, st.st_size, value)
+    return value
+
+
+def parse_update_delay_minutes(raw: str) -> Optional[int]:
+    value = int(raw.strip())
+    return value if value >= 1 else None
+
+
+def read_update_delay_minutes_from_file() -> Optional[int]:
+    return read_sidecar_file(get_update_delay_file_path(), parse_update_delay_minutes, None)
 
 
 def get_background_mode_file_path() -> str:
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    base_dir = os.path.dirname(script_dir)
-    return os.path.join(base_dir, BACKGROUND_MODE_FILE_NAME)
+    return BACKGROUND_MODE_FILE_PATH
+
+
+def parse_background_mode(raw: str) -> str:
+    value = raw.strip().lower()
+    return value if value in {"on", "off"} else "on"
 
 
 def read_background_mode() -> str:
-    path = get_background_mode_file_path()
-    if not os.path.isfile(path):
-        return "on"
-    try:
-        raw = open(path, "r", encoding="utf-8").read().strip().lower()
-    except Exception:  # noqa: BLE001
-        return "on"
-    if raw in {"on", "off"}:
-        return raw
-    return "on"
+    return read_sidecar_file(get_background_mode_file_path(), parse_background_mode, "on")
 
 
 @bot.command(name="autostart")
 @commands.has_permissions(administrator=True)
 async def autostart(ctx: commands.Context, mode: str = "status") -> None:
     action = mode.strip().lower()
-    if action not in {"on", "off", "status"}:
+    if action not in TOGGLE_MODES:
         await ctx.send("Usage: `!autostart <on|off|status>`")
         return
+    requested_state = TOGGLE_MODES[action]
 
     script_path = get_autostart_script_path()
     if not os.path.isfile(script_path):
@@ -1692,38 +2225,43 @@ async def autostart(ctx: commands.Context, mode: str = "status") -> None:
         return
 
     try:
-        result = subprocess.run(
-            ["bash", script_path, action],
-            check=False,
-            capture_output=True,
-            text=True,
-            timeout=20,
+        proc = await asyncio.create_subprocess_exec(
+            "bash",
+            script_path,
+            action,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
     except Exception as exc:
         await ctx.send(f"Erreur execution autostart: {exc}")
         return
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=20)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        await ctx.send("Erreur execution autostart: delai de 20s depasse")
+        return
 
-    output = (result.stdout or "").strip()
-    error_output = (result.stderr or "").strip()
+    output = stdout.decode("utf-8", "replace").strip()
+    error_output = stderr.decode("utf-8", "replace").strip()
 
-    if result.returncode != 0:
-        details = error_output or output or f"code={result.returncode}"
+    if proc.returncode != 0:
+        details = error_output or output or f"code={proc.returncode}"
         await ctx.send(f"Echec autostart `{action}`: {details}")
         return
 
-    detected_state: Optional[bool] = None
-    if "enabled" in output.lower():
-        detected_state = True
-    elif "disabled" in output.lower():
-        detected_state = False
-
-    if action == "on":
-        detected_state = True
-    elif action == "off":
-        detected_state = False
+    detected_state = requested_state
+    if detected_state is None:
+        output_lower = output.lower()
+        if "enabled" in output_lower:
+            detected_state = True
+        elif "disabled" in output_lower:
+            detected_state = False
 
     if detected_state is not None:
         save_reconciled_config({"boot_autostart_enabled": detected_state})
+        await bot.flush_config()
 
     final_state = "inconnu"
     if detected_state is True:
@@ -1739,19 +2277,20 @@ async def autostart(ctx: commands.Context, mode: str = "status") -> None:
 @commands.has_permissions(administrator=True)
 async def background_mode(ctx: commands.Context, mode: str = "status") -> None:
     action = mode.strip().lower()
-    if action not in {"on", "off", "status"}:
+    if action not in TOGGLE_MODES:
         await ctx.send("Usage: `!background_mode <on|off|status>`")
         return
+    requested_state = TOGGLE_MODES[action]
 
     file_path = get_background_mode_file_path()
-    if action in {"on", "off"}:
+    if requested_state is not None:
         try:
-            with open(file_path, "w", encoding="utf-8") as file_obj:
-                file_obj.write(f"{action}\n")
+            await asyncio.to_thread(write_text_file_if_changed, file_path, f"{action}\n")
         except Exception as exc:
             await ctx.send(f"Echec sauvegarde mode arriere-plan: {exc}")
             return
-        save_reconciled_config({"background_mode_enabled": action == "on"})
+        save_reconciled_config({"background_mode_enabled": requested_state})
+        await bot.flush_config()
 
     current = read_background_mode()
     state = "actif" if current == "on" else "inactif"
@@ -1767,38 +2306,59 @@ async def set_update_delay(ctx: commands.Context, minutes: int) -> None:
 
     delay_path = get_update_delay_file_path()
     try:
-        with open(delay_path, "w", encoding="utf-8") as file_obj:
-            file_obj.write(f"{minutes}\n")
+        await asyncio.to_thread(write_text_file_if_changed, delay_path, f"{minutes}\n")
     except Exception as exc:
         await ctx.send(f"Echec sauvegarde delai update: {exc}")
         return
 
     save_reconciled_config({"update_check_delay_minutes": minutes})
+    await bot.flush_config()
     await ctx.send(f"Delai de verification des updates defini a `{minutes}` minute(s).")
 
 
+def read_log_tail(path: str, line_count: int) -> str:
+    # Like `tail -n`: read backwards in blocks until enough lines are buffered.
+    with open(path, "rb") as file_obj:
+        end = file_obj.seek(0, os.SEEK_END)
+        data = b""
+        while end > 0 and data.count(b"\n") <= line_count:
+            step = min(8192, end)
+            end -= step
+            file_obj.seek(end)
+            data = file_obj.read(step) + data
+        if hasattr(os, "posix_fadvise"):
+            # One-shot read: let the kernel drop these log pages instead of keeping them cached.
+            try:
+                os.posix_fadvise(file_obj.fileno(), end, 0, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass
+    text = data.decode("utf-8", "replace").replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if text.endswith("\n"):
+        return "\n".join(lines[-line_count - 1 :])
+    return "\n".join(lines[-line_count:])
+
+
 @bot.command(name="show_logs")
 @commands.has_permissions(administrator=True)
 async def show_logs(ctx: commands.Context, lines: int = 40) -> None:
     safe_lines = max(5, min(lines, 200))
-    log_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "update.log")
+    log_path = UPDATE_LOG_PATH
     if not os.path.isfile(log_path):
         await ctx.send(f"Log introuvable: `{log_path}`")
         return
 
     try:
-        with open(log_path, "r", encoding="utf-8", errors="replace") as file_obj:
-            content_lines = file_obj.readlines()
+        tail_text = await asyncio.to_thread(read_log_tail, log_path, safe_lines)
     except Exception as exc:
         await ctx.send(f"Echec lecture log: {exc}")
         return
 
-    tail_lines = content_lines[-safe_lines:]
-    if not tail_lines:
+    if not tail_text:
         await ctx.send("Le log est vide.")
         return
 
-    payload = "".join(tail_lines).strip()
+    payload = tail_text.strip()
     if len(payload) > 1800:
         payload = payload[-1800:]
         payload = "(tronque)\n" + payload
@@ -1810,7 +2370,8 @@ async def show_logs(ctx: commands.Context, lines: int = 40) -> None:
 @commands.has_permissions(administrator=True)
 async def backup_config(ctx: commands.Context) -> None:
     try:
-        backup_path = create_config_backup(prefix="bot_config_backup")
+        async with bot.config_lock:
+            backup_path = await asyncio.to_thread(create_config_backup, "bot_config_backup")
     except Exception as exc:
         await ctx.send(f"Echec backup config: {exc}")
         return
@@ -1820,7 +2381,7 @@ async def backup_config(ctx: commands.Context) -> None:
 @bot.command(name="restore_config")
 @commands.has_permissions(administrator=True)
 async def restore_config(ctx: commands.Context, backup_filename: Optional[str] = None) -> None:
-    backups = list_config_backups()
+    backups = await asyncio.to_thread(list_config_backups)
     if not backups:
         await ctx.send("Aucune backup disponible. Utilise `!backup_config` d'abord.")
         return
@@ -1839,9 +2400,13 @@ async def restore_config(ctx: commands.Context, backup_filename: Optional[str] =
         selected = backups[0]
 
     try:
-        rollback_path = create_config_backup(prefix="bot_config_pre_restore")
-        shutil.copy2(selected, config_file_path())
+        async with bot.config_lock:
+            rollback_path = await asyncio.to_thread(create_config_backup, "bot_config_pre_restore")
+            await asyncio.to_thread(replace_config_file, selected, config_file_path())
+            # Anything staged during the copy belongs to the replaced config.
+            bot.config.invalidate()
         save_reconciled_config()
+        await bot.flush_config()
     except Exception as exc:
         await ctx.send(f"Echec restoration config: {exc}")
         return
@@ -1854,8 +2419,8 @@ async def restore_config(ctx: commands.Context, backup_filename: Optional[str] =
 
 @bot.command(name="show_config")
 async def show_config(ctx: commands.Context) -> None:
-    cfg = bot.config.load()
-    api_key = os.getenv("ALPINN_API_KEY", "").strip()
+    cfg = bot.config.view()
+    api_key = ALPINN_API_KEY
     base_url = cfg.get("base_url", "(vide)")
     key_state = "definie" if api_key else "absente"
     autostart_enabled = bool(cfg.get("boot_autostart_enabled", False))
@@ -1877,23 +2442,30 @@ async def show_config(ctx: commands.Context) -> None:
     )
 
 
+# (base_url, rendered catalogue) of the last !endpoints call.
+_endpoints_message_cache: Tuple[str, str] = ("", "")
+
+
+def endpoints_message() -> str:
+    global _endpoints_message_cache
+    base_url = bot.config.view().get("base_url") or "http://localhost/alpinn.ch_dynamic/public"
+    cached_url, cached_message = _endpoints_message_cache
+    if cached_url == base_url:
+        return cached_message
+    lines = [f"- `{name}` -> {base_url}{_ENDPOINT_PATHS[name]}" for name in ENDPOINT_NAMES]
+    message = "Catalogue endpoints:\n" + "\n".join(lines)
+    _endpoints_message_cache = (base_url, message)
+    return message
+
+
 @bot.command(name="endpoints")
 async def endpoints(ctx: commands.Context) -> None:
-    base_url = bot.config.load().get("base_url") or "http://localhost/alpinn.ch_dynamic/public"
-    lines = [
-        f"- `association` -> {base_url}/api/v1/association.php",
-        f"- `news` -> {base_url}/api/v1/news.php",
-        f"- `statuts` -> {base_url}/api/v1/statuts.php",
-        f"- `staff` -> {base_url}/api/v1/staff.php",
-        f"- `activities` -> {base_url}/api/v1/activities.php",
-        f"- `events` -> {base_url}/api/v1/events.php",
-    ]
-    await ctx.send("Catalogue endpoints:\n" + "\n".join(lines))
+    await ctx.send(endpoints_message())
 
 
 @bot.command(name="list_endpoints")
 async def list_endpoints(ctx: commands.Context) -> None:
-    await endpoints(ctx)
+    await ctx.send(endpoints_message())
 
 
 @bot.command(name="fetch")
@@ -1961,30 +2533,6 @@ async def events(ctx: commands.Context, *, query: str = "") -> None:
     await call_and_send(ctx, "events", params)
 
 
-@set_channel.error
-@unset_channel.error
-@enable_endpoint.error
-@disable_endpoint.error
-@enable_news.error
-@enable_all_endpoints.error
-@refresh_all_now.error
-@disable_news.error
-@clear.error
-@reboot.error
-@autostart.error
-@background_mode.error
-@set_update_delay.error
-@show_logs.error
-@backup_config.error
-@restore_config.error
-@set_base_url.error
-async def admin_only_error(ctx: commands.Context, error: commands.CommandError) -> None:
-    if isinstance(error, commands.MissingPermissions):
-        await ctx.send("Commande reservee aux administrateurs.")
-        return
-    await ctx.send(f"Erreur: {error}")
-
-
 def main() -> None:
     token = os.getenv("DISCORD_BOT_TOKEN")
     if not token:
@@ -1992,6 +2540,8 @@ def main() -> None:
     bot.run(token)
     if REBOOT_REQUESTED:
         raise SystemExit(42)
+    if bot.stopped_by_signal:
+        raise SystemExit(128 + signal.SIGTERM)
 
 
 if __name__ == "__main__":
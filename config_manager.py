@@ -1,11 +1,50 @@
+import copy
 import json
+import os
+import stat
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # Non-str keys or oversized ints: the stdlib encoder still handles them.
+            pass
+    return json.dumps(data, indent=2).encode("utf-8")
 
 
 class ConfigManager:
-    def __init__(self, filename: str) -> None:
+    def __init__(self, filename: str, cache: bool = True) -> None:
         self.path = Path(filename)
+        self.cache_enabled = cache
+        # (st_mtime_ns, st_size, parsed config) of the last read.
+        self._cache: Optional[Tuple[int, int, Dict[str, Any]]] = None
+        # Config accepted by stage() but not written yet; load() serves it first.
+        self._pending: Optional[Dict[str, Any]] = None
+        # stage() runs on the event loop while flush() may run in a worker thread.
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # Bumped whenever the served config may change; flush() writes what is already served.
+        self._generation = 0
+        # Bytes of the last uncached read or write: without the cache, a hand edit is only
+        # seen by comparing contents.
+        self._uncached_raw: Optional[bytes] = None
+        default = self._default()
+        self._default_keys = frozenset(default)
+        self._container_types = {key: type(value) for key, value in default.items() if isinstance(value, (dict, list))}
 
     def _default(self) -> Dict[str, Any]:
         return {
@@ -21,24 +60,164 @@ class ConfigManager:
             "auto_association_signatures": {},
         }
 
+    def _merge_defaults(self, data: Any) -> Dict[str, Any]:
+        if not isinstance(data, dict):
+            return self._default()
+        # Files written by save() already hold every key with the right types: use them as is.
+        if self._default_keys <= data.keys() and all(
+            type(data[key]) is kind for key, kind in self._container_types.items()
+        ):
+            return data
+        merged = self._default()
+        # Validated once here so callers can trust the container types of known keys.
+        for key, value in data.items():
+            default = merged.get(key)
+            if isinstance(default, (dict, list)) and type(value) is not type(default):
+                continue
+            merged[key] = value
+        return merged
+
     def load(self) -> Dict[str, Any]:
-        if not self.path.exists():
+        data, shared = self._read()
+        return copy.deepcopy(data) if shared else data
+
+    def view(self) -> Dict[str, Any]:
+        # Shared, uncopied config for read-only callers: never mutate the result.
+        return self._read()[0]
+
+    def subset(self, *keys: str) -> Dict[str, Any]:
+        # Private copies of just the subtrees a caller is about to modify.
+        data = self.view()
+        return {key: copy.deepcopy(data[key]) for key in keys if key in data}
+
+    def _read(self) -> Tuple[Dict[str, Any], bool]:
+        if self._pending is not None:
+            return self._pending, True
+        # One stat() both detects a missing file and validates the cache.
+        stat_key: Optional[Tuple[int, int]] = None
+        try:
+            st = self.path.stat()
+            stat_key = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
             data = self._default()
-            self.path.write_text(json.dumps(data, indent=2), encoding="utf-8")
-            return data
+            self.save(data)
+            return data, False
+        except OSError:
+            stat_key = None
 
+        if not self.cache_enabled:
+            stat_key = None
+        cached = self._cache
+        if stat_key is not None and cached is not None and cached[:2] == stat_key:
+            return cached[2], True
+
+        raw = b""
         try:
-            raw = self.path.read_text(encoding="utf-8")
-            data = json.loads(raw)
+            fd = os.open(self.path, os.O_RDONLY)
+            try:
+                # One read sized from the open file; its fstat also keys the cache entry.
+                st = os.fstat(fd)
+                raw = os.read(fd, st.st_size)
+            finally:
+                os.close(fd)
+            if stat_key is not None:
+                stat_key = (st.st_mtime_ns, st.st_size)
+            data = _loads(raw)
         except Exception:  # noqa: BLE001
             data = self._default()
 
-        merged = self._default()
-        merged.update(data if isinstance(data, dict) else {})
-        return merged
+        merged = self._merge_defaults(data)
+        if stat_key is not None:
+            # The file changed outside this manager (its own writes refill the cache).
+            with self._pending_lock:
+                self._generation += 1
+            self._cache = (stat_key[0], stat_key[1], merged)
+            return merged, True
+        if raw != self._uncached_raw:
+            with self._pending_lock:
+                self._uncached_raw = raw
+                self._generation += 1
+        return merged, False
+
+    def save(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        self._write(data)
+        with self._pending_lock:
+            self._pending = None
+            self._generation += 1
+        return data
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        raw = _dumps(data)
+        # Writes come from the event loop and from flush() in worker threads: one at a time,
+        # each through its own temp file swapped in, so a crash never leaves a truncated config.
+        with self._write_lock:
+            try:
+                mode = stat.S_IMODE(os.stat(self.path).st_mode)
+            except OSError:
+                mode = 0o644
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name + ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as tmp_file:
+                    tmp_file.write(raw)
+                os.chmod(tmp_name, mode)
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+            self._cache = None
+            self._uncached_raw = raw
+            if self.cache_enabled:
+                # Keep what was just written so the next load() skips the disk read.
+                try:
+                    st = self.path.stat()
+                except OSError:
+                    return
+                merged = self._merge_defaults(_loads(raw))
+                self._cache = (st.st_mtime_ns, st.st_size, merged)
+
+    @property
+    def generation(self) -> int:
+        # Unchanged between two reads means the same config content, unlike view() identity.
+        return self._generation
+
+    @property
+    def dirty(self) -> bool:
+        return self._pending is not None
+
+    def stage(self, patch: Dict[str, Any]) -> bool:
+        current = self.view()
+        # Steady-state refresh passes hand back the state they read: nothing to write.
+        if all(key in current and current[key] == value for key, value in patch.items()):
+            return False
+        # Patches replace whole top-level keys: a shallow copy is enough and skips the deep copy.
+        data = dict(current)
+        data.update(patch)
+        with self._pending_lock:
+            self._pending = data
+            self._generation += 1
+        return True
+
+    def invalidate(self) -> None:
+        # The file was replaced outside save(): drop staged and cached state.
+        with self._pending_lock:
+            self._pending = None
+            self._generation += 1
+        self._cache = None
+
+    def flush(self) -> None:
+        # Safe to run in a worker thread: a config staged meanwhile stays pending.
+        pending = self._pending
+        if pending is None:
+            return
+        self._write(pending)
+        with self._pending_lock:
+            if self._pending is pending:
+                self._pending = None
 
     def update(self, patch: Dict[str, Any]) -> Dict[str, Any]:
-        data = self.load()
+        data = dict(self.view())
         data.update(patch)
-        self.path.write_text(json.dumps(data, indent=2), encoding="utf-8")
-        return data
+        return self.save(data)
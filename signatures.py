@@ -0,0 +1,40 @@
+import hashlib
+import re
+from typing import Any
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+
+# Bump when payload_signature() changes so stored signatures are discarded once.
+SIGNATURE_SCHEMA = 3
+
+# Relative "Mise a jour" timestamp: rewritten on every pass, so not part of the content.
+_RE_DISCORD_TS = re.compile(r"<t:\d+:R>")
+
+
+# Signatures only detect content changes, no cryptographic property is needed.
+def _new_sig_hasher() -> Any:
+    if xxhash is not None:
+        return xxhash.xxh3_64()
+    if blake3 is not None:
+        return blake3.blake3()
+    return hashlib.blake2b(digest_size=8)
+
+
+def payload_signature(content: str, image_url: str) -> str:
+    hasher = _new_sig_hasher()
+    if "<t:" in content:
+        content = _RE_DISCORD_TS.sub("", content)
+    hasher.update(content.encode("utf-8"))
+    hasher.update(b"\n[image]")
+    hasher.update(image_url.encode("utf-8"))
+    # 64 bits are plenty to detect a change and keep bot_config.json small.
+    return hasher.hexdigest()[:16]
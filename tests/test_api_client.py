@@ -0,0 +1,50 @@
+import unittest
+from unittest import mock
+
+try:
+    import api_client
+except ImportError:
+    api_client = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+@unittest.skipIf(api_client is None, "aiohttp requis")
+class CooldownTest(unittest.TestCase):
+    def test_server_cooldown_blocks_without_spending_credit(self) -> None:
+        client = api_client.AlpinnApiClient(rate_limit_seconds=1)
+        client._defer_until(2.5)
+        with self.assertRaises(api_client.ApiRateLimitError) as ctx:
+            client._check_cooldown()
+        self.assertEqual(ctx.exception.remaining_seconds, 3)
+        self.assertEqual(client._credit_ns, client._capacity_ns)
+
+
+@unittest.skipIf(api_client is None or api_client.httpx is None, "httpx[http2] et aiohttp requis")
+class HttpxFetchTest(unittest.IsolatedAsyncioTestCase):
+    async def test_follows_301(self) -> None:
+        def handler(request: "httpx.Request") -> "httpx.Response":
+            if request.url.path == "/old/api/v1/news.php":
+                return httpx.Response(301, headers={"Location": "https://example.test/new/api/v1/news.php"})
+            return httpx.Response(200, json={"items": [1]})
+
+        real_client = httpx.AsyncClient
+
+        def make_client(**kwargs: object) -> "httpx.AsyncClient":
+            # Keep the options chosen by AlpinnApiClient, only swap the network for a mock.
+            return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+        client = api_client.AlpinnApiClient(rate_limit_seconds=1)
+        try:
+            with mock.patch.object(httpx, "AsyncClient", side_effect=make_client):
+                payload = await client.get_json("http://example.test/old", "/api/v1/news.php", "key")
+        finally:
+            await client.close()
+        self.assertEqual(payload, {"items": [1]})
+
+
+if __name__ == "__main__":
+    unittest.main()
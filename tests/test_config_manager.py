@@ -0,0 +1,91 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from config_manager import ConfigManager
+
+
+class StagedConfigTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "bot_config.json"
+        self.config = ConfigManager(str(self.path))
+        self.config.save(self.config.load())
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def read_file(self) -> dict:
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+    def test_stage_unchanged_patch_is_noop(self) -> None:
+        generation = self.config.generation
+        self.assertFalse(self.config.stage({"channels": {}, "auto_messages": {}}))
+        self.assertFalse(self.config.dirty)
+        self.assertEqual(self.config.generation, generation)
+
+        self.assertTrue(self.config.stage({"channels": {"news": [1]}}))
+        self.assertTrue(self.config.dirty)
+        self.assertNotEqual(self.config.generation, generation)
+
+    def test_flush_keeps_config_staged_during_write(self) -> None:
+        self.config.stage({"base_url": "https://first.test"})
+        write = self.config._write
+
+        def write_then_stage(data: dict) -> None:
+            write(data)
+            # What the event loop would stage while flush() runs in a worker thread.
+            self.config.stage({"base_url": "https://second.test"})
+
+        self.config._write = write_then_stage
+        self.config.flush()
+        self.config._write = write
+
+        self.assertEqual(self.read_file()["base_url"], "https://first.test")
+        self.assertTrue(self.config.dirty)
+        self.assertEqual(self.config.view()["base_url"], "https://second.test")
+
+        self.config.flush()
+        self.assertFalse(self.config.dirty)
+        self.assertEqual(self.read_file()["base_url"], "https://second.test")
+
+    def test_flush_keeps_generation(self) -> None:
+        self.config.stage({"base_url": "https://first.test"})
+        generation = self.config.generation
+        self.config.flush()
+        self.assertEqual(self.config.view()["base_url"], "https://first.test")
+        self.assertEqual(self.config.generation, generation)
+
+    def test_invalidate_drops_pending_state(self) -> None:
+        self.config.stage({"base_url": "https://staged.test"})
+        self.path.write_text(json.dumps({"base_url": "https://restored.test"}), encoding="utf-8")
+        generation = self.config.generation
+
+        self.config.invalidate()
+
+        self.assertFalse(self.config.dirty)
+        self.assertNotEqual(self.config.generation, generation)
+        self.assertEqual(self.config.view()["base_url"], "https://restored.test")
+        self.config.flush()
+        self.assertEqual(self.read_file()["base_url"], "https://restored.test")
+
+
+class UncachedGenerationTest(unittest.TestCase):
+    def test_hand_edit_bumps_generation_without_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bot_config.json"
+            config = ConfigManager(str(path), cache=False)
+            config.save(config.load())
+            config.view()
+            generation = config.generation
+            config.view()
+            self.assertEqual(config.generation, generation)
+
+            path.write_text(json.dumps({"auto_enabled_endpoints": ["news"]}), encoding="utf-8")
+            self.assertEqual(config.view()["auto_enabled_endpoints"], ["news"])
+            self.assertNotEqual(config.generation, generation)
+
+
+if __name__ == "__main__":
+    unittest.main()
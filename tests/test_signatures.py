@@ -0,0 +1,21 @@
+import unittest
+
+from signatures import payload_signature
+
+
+class PayloadSignatureTest(unittest.TestCase):
+    def test_relative_timestamp_is_ignored(self) -> None:
+        first = payload_signature("**News**\nMise a jour <t:1700000000:R>\nTexte", "https://img.test/a.png")
+        second = payload_signature("**News**\nMise a jour <t:1700000600:R>\nTexte", "https://img.test/a.png")
+        self.assertEqual(first, second)
+
+    def test_content_and_image_changes_are_detected(self) -> None:
+        base = payload_signature("Texte <t:1700000000:R>", "")
+        self.assertNotEqual(base, payload_signature("Autre texte <t:1700000000:R>", ""))
+        self.assertNotEqual(base, payload_signature("Texte <t:1700000000:R>", "https://img.test/a.png"))
+        # Only the relative form is stripped: absolute dates are real content.
+        self.assertNotEqual(payload_signature("<t:1700000000:F>", ""), payload_signature("<t:1700000600:F>", ""))
+
+
+if __name__ == "__main__":
+    unittest.main()